@@ -2,6 +2,12 @@ from typing import TypedDict, Annotated, List, Dict
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
 import asyncio
+from datetime import datetime, timezone
+
+from models.job import JobRecord
+from services.llm_budget import LLMBudget
+from services.job_filter import JobFilter
+from services.profiler import span
 
 class WorkflowState(TypedDict):
     """State passed between workflow nodes"""
@@ -9,20 +15,32 @@ class WorkflowState(TypedDict):
     resume_id: str
     resume_data: Dict
     job_sources: List[str]
-    all_jobs: List[Dict]
-    matched_jobs: List[Dict]
+    all_jobs: List[JobRecord]
+    scored_jobs: List[JobRecord]
+    matched_jobs: List[JobRecord]
     send_email: bool
+    llm_budget: Dict
+    llm_usage: Dict
+    preferences: Dict
+    filter_report: Dict
     user_email: str
     status: str
     error: str
 
 class JobMatcherWorkflow:
-    def __init__(self, db, resume_parser, job_matcher, email_service, job_fetchers):
+    def __init__(self, db, resume_parser, job_matcher, email_service, job_fetchers, job_catalog=None, job_enricher=None,
+                 embedding_index=None, embedder=None, resume_processor=None, queue_size: int = 50):
         self.db = db
         self.resume_parser = resume_parser
         self.job_matcher = job_matcher
         self.email_service = email_service
         self.job_fetchers = job_fetchers
+        self.job_catalog = job_catalog
+        self.job_enricher = job_enricher
+        self.embedding_index = embedding_index
+        self.embedder = embedder
+        self.resume_processor = resume_processor
+        self.queue_size = queue_size  # Max jobs buffered between fetchers and matcher
         self.graph = self._build_graph()
     
     def _build_graph(self) -> StateGraph:
@@ -30,11 +48,11 @@ class JobMatcherWorkflow:
         workflow = StateGraph(WorkflowState)
         
         # Add nodes
-        workflow.add_node("fetch_resume", self.fetch_resume_node)
-        workflow.add_node("parse_resume", self.parse_resume_node)
-        workflow.add_node("fetch_jobs", self.fetch_jobs_node)
-        workflow.add_node("match_jobs", self.match_jobs_node)
-        workflow.add_node("send_email", self.send_email_node)
+        workflow.add_node("fetch_resume", self._traced("fetch_resume", self.fetch_resume_node))
+        workflow.add_node("parse_resume", self._traced("parse_resume", self.parse_resume_node))
+        workflow.add_node("fetch_jobs", self._traced("fetch_jobs", self.fetch_jobs_node))
+        workflow.add_node("match_jobs", self._traced("match_jobs", self.match_jobs_node))
+        workflow.add_node("send_email", self._traced("send_email", self.send_email_node))
         
         # Define edges
         workflow.add_edge(START, "fetch_resume")
@@ -46,6 +64,13 @@ class JobMatcherWorkflow:
         
         return workflow.compile()
     
+    def _traced(self, name: str, node):
+        """Wrap a node so profiled executions record it on their timeline"""
+        async def run_node(state: WorkflowState) -> WorkflowState:
+            with span("node", name):
+                return await node(state)
+        return run_node
+    
     async def fetch_resume_node(self, state: WorkflowState) -> WorkflowState:
         """Fetch resume from database"""
         try:
@@ -73,6 +98,12 @@ class JobMatcherWorkflow:
                 state["status"] = "resume_parsed"
                 return state
             
+            # Usually already parsed (or in flight) since upload
+            if self.resume_processor:
+                state["resume_data"].update(await self.resume_processor.ensure_parsed(state["resume_data"]))
+                state["status"] = "resume_parsed"
+                return state
+            
             # Parse using GPT-4o
             parsed_data = await self.resume_parser.extract_skills_and_experience(resume_text)
             
@@ -98,49 +129,106 @@ class JobMatcherWorkflow:
             return state
     
     async def fetch_jobs_node(self, state: WorkflowState) -> WorkflowState:
-        """Fetch jobs from all sources in parallel"""
+        """Fetch jobs from all sources and score them as they stream in.
+        
+        Fetchers push jobs into a bounded queue and the matcher scores each
+        batch as soon as it fills, so scraping and LLM latency overlap instead
+        of waiting for the slowest source.
+        """
+        producers = []
         try:
             all_jobs = []
-            tasks = []
+            queue = asyncio.Queue(maxsize=self.queue_size)
             
             # Create keywords from resume skills
             keywords = " ".join(state["resume_data"].get("parsed_skills", [])[:3])  # Top 3 skills
             if not keywords:
                 keywords = "software engineer"
             
-            # Fetch from each source
+            # Start a producer for each source
             for source in state["job_sources"]:
                 if source in self.job_fetchers:
-                    tasks.append(self.job_fetchers[source].fetch_jobs(keywords=keywords, limit=15))
+                    producers.append(asyncio.create_task(
+                        self._produce_jobs(self.job_fetchers[source], keywords, queue)
+                    ))
+            
+            async def close_queue(fetch_tasks):
+                await asyncio.gather(*fetch_tasks, return_exceptions=True)
+                await queue.put(None)
             
-            # Execute all fetchers in parallel
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            producers.append(asyncio.create_task(close_queue(list(producers))))
             
-            # Collect all jobs
-            for result in results:
-                if isinstance(result, list):
-                    all_jobs.extend(result)
+            async def job_stream():
+                while True:
+                    job = await queue.get()
+                    if job is None:
+                        return
+                    all_jobs.append(job)
+                    yield job
             
+            # Fetch full descriptions for promising jobs with placeholder text
+            resume_profile = self._resume_profile(state)
+            enrichment = self.job_enricher.for_resume(resume_profile) if self.job_enricher else None
+            budget = LLMBudget.from_limits(**state.get("llm_budget", {}))
+            job_filter = JobFilter(state.get("preferences"))
+            
+            state["scored_jobs"] = await self.job_matcher.match_stream(
+                resume_profile, job_stream(),
+                prepare_batch=enrichment.enrich if enrichment else None,
+                budget=budget,
+                job_filter=job_filter
+            )
             state["all_jobs"] = all_jobs
+            state["llm_usage"] = budget.summary()
+            state["filter_report"] = job_filter.report()
+            
+            # Keep every posting (with its skill tokens) for later retrieval
+            if self.job_catalog:
+                await self.job_catalog.store_jobs(all_jobs)
+            if self.embedding_index is not None:
+                await asyncio.to_thread(self.embedding_index.add_jobs, all_jobs, self.embedder)
+            
             state["status"] = "jobs_fetched"
             return state
         except Exception as e:
             state["error"] = f"Error fetching jobs: {str(e)}"
             state["status"] = "failed"
             return state
+        finally:
+            for task in producers:
+                task.cancel()
+    
+    async def _produce_jobs(self, fetcher, keywords: str, queue: asyncio.Queue):
+        """Stream one source's jobs into the shared queue"""
+        try:
+            async for job in fetcher.stream_jobs(keywords=keywords, limit=15):
+                await queue.put(job)
+        except Exception as e:
+            print(f"Error streaming jobs from {type(fetcher).__name__}: {str(e)}")
+    
+    def _resume_profile(self, state: WorkflowState) -> Dict:
+        return {
+            "skills": state["resume_data"].get("parsed_skills", []),
+            "experience": state["resume_data"].get("parsed_experience", ""),
+            "expertise": state["resume_data"].get("expertise", [])
+        }
     
     async def match_jobs_node(self, state: WorkflowState) -> WorkflowState:
-        """Match jobs using GPT-4o"""
+        """Select the best matches from the jobs scored while fetching"""
         try:
-            resume_data = {
-                "skills": state["resume_data"].get("parsed_skills", []),
-                "experience": state["resume_data"].get("parsed_experience", ""),
-                "expertise": state["resume_data"].get("expertise", [])
-            }
+            state["matched_jobs"] = self.job_matcher.select_matches(state.get("scored_jobs", []))
             
-            matched_jobs = await self.job_matcher.match_jobs(resume_data, state["all_jobs"])
+            # Enrol the resume in delta matching, which scores catalog jobs
+            # stored after this watermark and advances it itself. A full run
+            # only scores what it fetched, so it never moves an existing
+            # watermark (that would skip jobs stored by other users' runs),
+            # and a run whose fetch or parse failed doesn't enrol it at all.
+            if not state.get("error"):
+                await self.db.resumes.update_one(
+                    {"id": state["resume_id"], "last_matched_at": {"$exists": False}},
+                    {"$set": {"last_matched_at": datetime.now(timezone.utc)}}
+                )
             
-            state["matched_jobs"] = matched_jobs
             state["status"] = "jobs_matched"
             return state
         except Exception as e:
@@ -148,6 +236,22 @@ class JobMatcherWorkflow:
             state["status"] = "failed"
             return state
     
+    async def shortlist_from_catalog(self, resume_data: Dict, k: int = 50) -> List[Dict]:
+        """Nearest catalog jobs to a resume document by embedding similarity"""
+        if self.embedding_index is None or not self.job_catalog:
+            return []
+        
+        # Stored by ResumeProcessor at upload; recomputed if missing or from another embedder
+        query = resume_data.get("skill_embedding")
+        if query is None or len(query) != self.embedder.dim:
+            query = self.embedder.embed_resume(resume_data)
+        hits = await asyncio.to_thread(self.embedding_index.search, query, k)
+        scores = dict(hits)
+        jobs = await self.job_catalog.get_jobs([fingerprint for fingerprint, _ in hits])
+        for job in jobs:
+            job["similarity"] = scores[job["fingerprint"]]
+        return jobs
+    
     async def send_email_node(self, state: WorkflowState) -> WorkflowState:
         """Send email with matched jobs"""
         try:
@@ -1,7 +1,9 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from dataclasses import dataclass, fields
+from typing import Optional, Dict
 from datetime import datetime, timezone
 import uuid
+import hashlib
 
 class Job(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -20,6 +22,78 @@ class JobMatch(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_id: str
     job_id: str
+    job_fingerprint: Optional[str] = None  # JobRecord.fingerprint, stable across runs
+    resume_id: Optional[str] = None
     match_score: float  # 0-100
     match_reason: str
-    matched_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
\ No newline at end of file
+    scorer: Optional[str] = None  # 'llm' or 'local'
+    matched_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+# Descriptions shorter than this are treated as listing-card placeholders
+PLACEHOLDER_DESCRIPTION_LENGTH = 80
+
+@dataclass(slots=True)
+class JobRecord:
+    """Compact job record passed through the workflow.
+    
+    Fetchers create one record per posting and the matcher scores it in place,
+    so the same object flows from scraping to the API response. orjson
+    serializes slotted dataclasses (and their datetimes) natively.
+    """
+    job_id: str
+    source: str
+    title: str
+    company: str
+    description: str
+    url: str
+    location: Optional[str] = None
+    salary: Optional[str] = None
+    posted_date: Optional[datetime] = None
+    match_score: Optional[float] = None  # 0-100, set by JobMatcher
+    match_reason: Optional[str] = None
+    scorer: Optional[str] = None  # 'llm', or 'local' when scored by keyword overlap
+    
+    @property
+    def has_placeholder_description(self) -> bool:
+        """True for listing-card stubs like 'View job details on LinkedIn'"""
+        return len(self.description or "") < PLACEHOLDER_DESCRIPTION_LENGTH
+    
+    @property
+    def fingerprint(self) -> str:
+        """Stable identity for the posting across runs (job_id is only unique per fetch)"""
+        key = f"{self.source}|{self.url}|{self.title}|{self.company}"
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+    
+    def to_document(self) -> Dict:
+        """Posting fields for the jobs catalog (scores are per-user and not stored)"""
+        return {
+            "fingerprint": self.fingerprint,
+            "job_id": self.job_id,
+            "source": self.source,
+            "title": self.title,
+            "company": self.company,
+            "description": self.description,
+            "url": self.url,
+            "location": self.location,
+            "salary": self.salary,
+            "posted_date": self.posted_date
+        }
+    
+    @classmethod
+    def from_document(cls, doc: Dict) -> "JobRecord":
+        """Build a record from a catalog document, ignoring extra fields"""
+        return cls(**{f.name: doc[f.name] for f in fields(cls) if f.name in doc})
+
+def job_match_document(user_id: str, job: JobRecord, matched_at: str, resume_id: Optional[str] = None) -> Dict:
+    """Build a `job_matches` document (same shape as JobMatch) for a scored job"""
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "job_id": job.job_id,
+        "job_fingerprint": job.fingerprint,
+        "resume_id": resume_id,
+        "match_score": job.match_score or 0,
+        "match_reason": job.match_reason or "",
+        "scorer": job.scorer,
+        "matched_at": matched_at
+    }
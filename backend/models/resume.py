@@ -9,6 +9,7 @@ class Resume(BaseModel):
     resume_text: str
     parsed_skills: List[str] = []
     parsed_experience: Optional[str] = None
+    parse_status: str = "pending"  # pending, parsing, parsed, failed (set by ResumeProcessor)
     file_name: Optional[str] = None
     file_type: Optional[str] = None  # 'text' or 'pdf'
     uploaded_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -16,4 +17,23 @@ class Resume(BaseModel):
 class ResumeCreate(BaseModel):
     resume_text: Optional[str] = None
     file_content: Optional[str] = None  # base64 encoded
-    file_name: Optional[str] = None
\ No newline at end of file
+    file_name: Optional[str] = None
+
+class ResumeImportFile(BaseModel):
+    file_name: str
+    user_id: str
+    status: str = "pending"  # pending, imported, failed (text extraction)
+    resume_id: Optional[str] = None
+    error: Optional[str] = None
+
+class ResumeImport(BaseModel):
+    """A bulk import job; skill parsing progress is read live from each resume's parse_status"""
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    owner_email: str
+    status: str = "processing"  # processing, completed
+    total: int = 0
+    imported: int = 0
+    failed: int = 0
+    files: List[ResumeImportFile] = []
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    completed_at: Optional[datetime] = None
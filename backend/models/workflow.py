@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 import uuid
 
@@ -12,10 +12,29 @@ class WorkflowExecution(BaseModel):
     jobs_matched: int = 0
     email_sent: bool = False
     error_message: Optional[str] = None
+    llm_usage: Optional[Dict[str, Any]] = None
+    filter_report: Optional[Dict[str, Any]] = None
+    profile_id: Optional[str] = None  # workflow_profiles record, when the run was profiled
     started_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     completed_at: Optional[datetime] = None
 
+class JobPreferences(BaseModel):
+    """Hard filters applied before scoring (empty means no restriction)"""
+    locations: List[str] = []  # Substrings of the job location, e.g. "New York", "Berlin"
+    remote_ok: bool = True  # Remote/flexible postings pass the location rule
+    max_age_days: Optional[float] = None
+    include_title_keywords: List[str] = []  # Title must contain at least one
+    exclude_title_keywords: List[str] = []
+    seniority: List[str] = []  # intern, junior, senior, lead, manager; titles without a level always pass
+
 class WorkflowRequest(BaseModel):
     resume_id: str
     job_sources: list[str] = Field(default=["linkedin", "indeed", "jobrights", "startups_gallery", "briansjobs", "glassdoor", "ycombinator", "wellfound"])
-    send_email: bool = True
\ No newline at end of file
+    send_email: bool = True
+    preferences: JobPreferences = Field(default_factory=JobPreferences)
+    # Per-execution LLM budget; unset limits use the LLM_MAX_*_PER_RUN env defaults
+    llm_max_calls: Optional[int] = None
+    llm_max_tokens: Optional[int] = None
+    llm_max_seconds: Optional[float] = None
+    # Capture a sampling profile and span timeline (also sampled via PROFILE_SAMPLE_RATE)
+    profile: bool = False
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""Measure how long a fresh interpreter takes to import the server module.
+
+Run from the backend directory:
+
+    python scripts/bench_startup.py --runs 10
+    python scripts/bench_startup.py --importtime   # slowest imports
+
+Each run is a separate subprocess, so the numbers reflect a cold worker boot
+(module caches on disk are warm after the first run).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+IMPORT_SNIPPET = """
+import time
+start = time.perf_counter()
+import server
+print(time.perf_counter() - start)
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    # server.py reads these at import time; the client connects lazily
+    env.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    env.setdefault("DB_NAME", "job_matcher_bench")
+    env["PYTHONPATH"] = str(BACKEND_DIR)
+    return env
+
+
+def time_import(runs: int):
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET],
+            cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True
+        )
+        timings.append(float(output.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def slowest_imports(top: int):
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:   self [us] | cumulative | imported package"
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--importtime", action="store_true", help="show the slowest imports instead")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.importtime:
+        print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+        for cumulative_us, self_us, name in slowest_imports(args.top):
+            print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+        return
+
+    timings = time_import(args.runs)
+    print(f"import server: runs={len(timings)} "
+          f"min={min(timings) * 1000:.1f}ms "
+          f"median={statistics.median(timings) * 1000:.1f}ms "
+          f"max={max(timings) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,399 @@
+"""In-process load generator for the FastAPI app.
+
+Drives the real `server.app` through httpx's ASGI transport, with the
+outside world replaced by local stand-ins:
+
+- fake job fetchers that yield synthetic postings after a tunable delay,
+- a fake Gemini model with tunable latency,
+- an in-memory substitute for the Mongo collections the endpoints touch.
+
+Each virtual user uploads a resume and then executes workflows against it in
+a loop. The report gives requests/sec and p50/p95/p99 latency per endpoint,
+plus event-loop lag (how late a 10ms timer fires), which exposes blocking
+calls on the loop. Run from the backend directory:
+
+    python scripts/loadtest.py --users 20 --duration 30 --llm-latency 0.8
+"""
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import os
+import re
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# server.py reads these at import time; nothing connects to them
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "job_matcher_loadtest")
+
+import httpx  # noqa: E402
+
+from models.job import JobRecord  # noqa: E402
+from services.job_fetchers.base import BaseScraper  # noqa: E402
+
+
+# ===== In-memory Mongo substitute =====
+
+def _get_path(doc, path):
+    value = doc
+    for part in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and part.isdigit():
+            value = value[int(part)] if int(part) < len(value) else None
+        else:
+            return None
+    return value
+
+
+def _matches(doc, query):
+    for path, condition in query.items():
+        value = _get_path(doc, path)
+        if isinstance(condition, dict) and any(key.startswith("$") for key in condition):
+            for op, operand in condition.items():
+                if op == "$exists" and (value is not None) != bool(operand):
+                    return False
+                if op == "$in" and not (set(value) & set(operand) if isinstance(value, list) else value in operand):
+                    return False
+                if op in ("$gt", "$gte", "$lt", "$lte"):
+                    if value is None:
+                        return False
+                    if op == "$gt" and not value > operand:
+                        return False
+                    if op == "$gte" and not value >= operand:
+                        return False
+                    if op == "$lt" and not value < operand:
+                        return False
+                    if op == "$lte" and not value <= operand:
+                        return False
+        elif value != condition:
+            return False
+    return True
+
+
+def _project(doc, projection):
+    if not projection:
+        return copy.deepcopy(doc)
+    included = [key for key, flag in projection.items() if flag and key != "_id"]
+    if included:
+        return {key: copy.deepcopy(doc[key]) for key in included if key in doc}
+    return {key: copy.deepcopy(value) for key, value in doc.items() if projection.get(key, 1)}
+
+
+def _apply_update(doc, update, inserted):
+    for key, value in update.get("$set", {}).items():
+        doc[key] = value
+    if inserted:
+        for key, value in update.get("$setOnInsert", {}).items():
+            doc[key] = value
+    for key, value in update.get("$max", {}).items():
+        if doc.get(key) is None or value > doc[key]:
+            doc[key] = value
+    for key, value in update.get("$inc", {}).items():
+        *parents, leaf = key.split(".")
+        target = doc
+        for part in parents:
+            target = target.setdefault(part, {})
+        target[leaf] = target.get(leaf, 0) + value
+    for key, condition in update.get("$pull", {}).items():
+        doc[key] = [item for item in doc.get(key, []) if not _matches(item, condition)]
+    for key, value in update.get("$push", {}).items():
+        items = doc.setdefault(key, [])
+        items.extend(value["$each"] if isinstance(value, dict) else [value])
+        if isinstance(value, dict):
+            for field, direction in reversed(list(value.get("$sort", {}).items())):
+                items.sort(key=lambda item: item.get(field), reverse=direction < 0)
+            if "$slice" in value:
+                del items[value["$slice"]:]
+
+
+class _Result:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class MemoryCursor:
+    def __init__(self, docs):
+        self.docs = docs
+    
+    def sort(self, key, direction=1):
+        self.docs.sort(key=lambda doc: (doc.get(key) is None, doc.get(key)), reverse=direction == -1)
+        return self
+    
+    async def to_list(self, length=None):
+        return self.docs if length is None else self.docs[:length]
+
+
+class MemoryCollection:
+    def __init__(self):
+        self.docs = []
+    
+    async def create_index(self, *args, **kwargs):
+        return "index"
+    
+    async def insert_one(self, doc):
+        self.docs.append(copy.deepcopy(doc))
+        return _Result(inserted_id=doc.get("id"))
+    
+    async def insert_many(self, docs):
+        self.docs.extend(copy.deepcopy(doc) for doc in docs)
+        return _Result(inserted_ids=[doc.get("id") for doc in docs])
+    
+    async def find_one(self, query, projection=None):
+        for doc in self.docs:
+            if _matches(doc, query):
+                return _project(doc, projection)
+        return None
+    
+    def find(self, query=None, projection=None):
+        return MemoryCursor([_project(doc, projection) for doc in self.docs if _matches(doc, query or {})])
+    
+    async def count_documents(self, query):
+        return sum(1 for doc in self.docs if _matches(doc, query))
+    
+    async def update_one(self, query, update, upsert=False):
+        for doc in self.docs:
+            if _matches(doc, query):
+                _apply_update(doc, update, inserted=False)
+                return _Result(matched_count=1, upserted_id=None)
+        if upsert:
+            doc = {key: value for key, value in query.items() if not isinstance(value, dict)}
+            _apply_update(doc, update, inserted=True)
+            self.docs.append(doc)
+            return _Result(matched_count=0, upserted_id=doc.get("id"))
+        return _Result(matched_count=0, upserted_id=None)
+    
+    async def bulk_write(self, operations, ordered=True):
+        upserted = 0
+        for operation in operations:
+            document = operation._doc
+            result = await self.update_one(operation._filter, document, upsert=operation._upsert)
+            upserted += result.matched_count == 0 and operation._upsert
+        return _Result(upserted_count=upserted)
+
+
+class MemoryDatabase:
+    def __init__(self):
+        self._collections = defaultdict(MemoryCollection)
+    
+    def __getattr__(self, name):
+        return self._collections[name]
+    
+    def __getitem__(self, name):
+        return self._collections[name]
+
+
+# ===== Fake job sources, LLM and email =====
+
+class FakeScraper(BaseScraper):
+    has_detail_pages = False
+    
+    def __init__(self, source, jobs_per_source, latency):
+        self.source = source
+        self.jobs_per_source = jobs_per_source
+        self.latency = latency
+    
+    async def stream_jobs(self, keywords="software engineer", limit=20, **kwargs):
+        for i in range(min(self.jobs_per_source, limit)):
+            await asyncio.sleep(self.latency / self.jobs_per_source)
+            yield JobRecord(
+                job_id=f"{self.source}_{i + 1}",
+                source=self.source,
+                title=f"{keywords.title()} Engineer {i + 1}",
+                company=f"{self.source.title()} Co",
+                description=f"Build {keywords} services with Python, React and AWS at scale.",
+                url=f"https://{self.source}.example/jobs/{i + 1}",
+                location="Remote",
+                posted_date=datetime.now(timezone.utc) - timedelta(hours=i)
+            )
+
+
+class _FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Stands in for the Gemini model; answers matcher and parser prompts"""
+    
+    def __init__(self, latency):
+        self.latency = latency
+    
+    async def generate_content_async(self, prompt, *args, **kwargs):
+        await asyncio.sleep(self.latency)
+        if "Jobs to evaluate" in prompt:
+            count = len(re.findall(r"^Job \d+:", prompt, re.M))
+            return _FakeResponse(json.dumps([
+                {"job_index": i, "match_score": 55 + (i * 11) % 45, "match_reason": "Synthetic match"}
+                for i in range(count)
+            ]))
+        return _FakeResponse(json.dumps({
+            "skills": ["Python", "React", "AWS"], "experience": "5 years", "expertise": ["Web Development"]
+        }))
+
+
+class FakeEmailService:
+    async def send_job_matches_email(self, recipient_email, matched_jobs):
+        return True
+
+
+# ===== Load generator =====
+
+class LoopLagMonitor:
+    """Measures how late a periodic timer fires; large values mean the loop was blocked"""
+    
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.samples = []
+        self._task = None
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+    
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+
+def install_stand_ins(args):
+    """Point the server module at the fake services; returns the ASGI app"""
+    import server
+    from langgraph.workflow import JobMatcherWorkflow
+    from services import llm
+    from services.embedding_index import HashingEmbedder
+    from services.job_catalog import JobCatalog
+    from services.job_fetchers.registry import FetcherRegistry
+    from services.llm_scheduler import LLMScheduler, set_scheduler
+    from services.match_summary import MatchSummaries
+    from services.resume_processor import ResumeProcessor
+    
+    db = MemoryDatabase()
+    # The server builds its embedder in a startup hook, which ASGITransport doesn't run
+    embedder = HashingEmbedder()
+    sources = [f"source{i + 1}" for i in range(args.sources)]
+    fetchers = FetcherRegistry({
+        source: (lambda source=source: FakeScraper(source, args.jobs_per_source, args.fetch_latency))
+        for source in sources
+    }, load_entry_points=False)
+    
+    llm.set_model(FakeModel(args.llm_latency))
+    set_scheduler(LLMScheduler(requests_per_minute=args.llm_rpm or None, max_concurrency=args.llm_concurrency))
+    server.db = db
+    server.job_fetchers = fetchers
+    server.job_catalog = JobCatalog(db)
+    server.resume_processor = ResumeProcessor(db, server.resume_parser, embedder)
+    server.match_summaries = MatchSummaries(db)
+    server.workflow = JobMatcherWorkflow(
+        db, server.resume_parser, server.job_matcher, FakeEmailService(), fetchers, server.job_catalog,
+        embedder=embedder, resume_processor=server.resume_processor
+    )
+    return server.app, sources
+
+
+async def virtual_user(client, user_index, sources, deadline, latencies, errors):
+    user_email = f"loadtest-{user_index}@example.com"
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.post("/api/resume/upload", data={
+            "user_email": user_email,
+            "resume_text": "Senior Python engineer with React and AWS experience. " * 20
+        })
+        latencies["resume/upload"].append(time.perf_counter() - start)
+        if response.status_code != 200:
+            errors["resume/upload"] += 1
+            continue
+        resume_id = response.json()["id"]
+        
+        for _ in range(3):
+            if time.perf_counter() >= deadline:
+                break
+            start = time.perf_counter()
+            response = await client.post(
+                "/api/workflow/execute",
+                params={"user_email": user_email},
+                json={"resume_id": resume_id, "job_sources": sources, "send_email": True}
+            )
+            latencies["workflow/execute"].append(time.perf_counter() - start)
+            if response.status_code != 200 or response.json().get("status") == "failed":
+                errors["workflow/execute"] += 1
+
+
+async def run_load(args):
+    app, sources = install_stand_ins(args)
+    logging.getLogger().setLevel(logging.WARNING)  # server.py configures INFO on import
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    monitor = LoopLagMonitor()
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+        monitor.start()
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*[
+            virtual_user(client, i, sources, deadline, latencies, errors) for i in range(args.users)
+        ])
+        elapsed = time.perf_counter() - started
+        await monitor.stop()
+    
+    total = sum(len(values) for values in latencies.values())
+    print(f"users={args.users} duration={elapsed:.1f}s requests={total} "
+          f"throughput={total / elapsed:.1f} req/s")
+    print(f"{'endpoint':<20} {'count':>6} {'req/s':>7} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for endpoint, values in sorted(latencies.items()):
+        print(f"{endpoint:<20} {len(values):>6} {len(values) / elapsed:>7.1f} {errors[endpoint]:>6} "
+              f"{_percentile(values, 50) * 1000:>8.1f} {_percentile(values, 95) * 1000:>8.1f} "
+              f"{_percentile(values, 99) * 1000:>8.1f}")
+    lag = monitor.samples
+    print(f"event-loop lag: p50={_percentile(lag, 50) * 1000:.1f}ms p99={_percentile(lag, 99) * 1000:.1f}ms "
+          f"max={max(lag, default=0) * 1000:.1f}ms mean={statistics.fmean(lag) * 1000 if lag else 0:.1f}ms")
+    
+    from services.llm_scheduler import get_scheduler
+    stats = get_scheduler().stats
+    print(f"llm calls: completed={stats['completed']} ({stats['completed'] / elapsed * 60:.0f}/min) "
+          f"rate_limited={stats['rate_limited']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds to run")
+    parser.add_argument("--sources", type=int, default=8, help="fake job sources per workflow")
+    parser.add_argument("--jobs-per-source", type=int, default=15)
+    parser.add_argument("--fetch-latency", type=float, default=0.5, help="seconds for a source to stream all its jobs")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="seconds per fake LLM call")
+    parser.add_argument("--llm-rpm", type=float, default=0, help="LLM requests-per-minute quota (0 = unlimited)")
+    parser.add_argument("--llm-concurrency", type=int, default=8, help="max concurrent LLM calls")
+    args = parser.parse_args()
+    asyncio.run(run_load(args))
+
+
+if __name__ == "__main__":
+    main()
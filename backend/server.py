@@ -1,13 +1,15 @@
 from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 from pathlib import Path
 import os
 import logging
-from typing import Optional, List
+from typing import Optional, List, Dict
 from pydantic import BaseModel
 import base64
+import asyncio
 
 # Load environment variables
 ROOT_DIR = Path(__file__).parent
@@ -15,23 +17,27 @@ load_dotenv(ROOT_DIR / '.env')
 
 # Import models
 from models.resume import Resume, ResumeCreate
-from models.job import Job, JobMatch
+from models.job import Job, job_match_document
 from models.workflow import WorkflowExecution, WorkflowRequest
 
 # Import services
 from services.resume_parser import ResumeParser
 from services.job_matcher import JobMatcher
 from services.email_service import EmailService
-
-# Import job fetchers
-from services.job_fetchers.linkedin import LinkedInScraper
-from services.job_fetchers.indeed import IndeedScraper
-from services.job_fetchers.jobrights import JobrightsScraper
-from services.job_fetchers.startups_gallery import StartupsGalleryScraper
-from services.job_fetchers.briansjobs import BriansJobsScraper
-from services.job_fetchers.glassdoor import GlassdoorScraper
-from services.job_fetchers.ycombinator import YCombinatorScraper
-from services.job_fetchers.wellfound import WellfoundScraper
+from services.job_catalog import JobCatalog
+from services.job_enricher import JobEnricher
+from services.delta_matcher import DeltaMatcher
+from services.resume_processor import ResumeProcessor
+from services.resume_importer import ResumeImporter
+from services.match_summary import MatchSummaries
+from services.leases import LeaseManager, replica_id
+from services.execution_queue import ExecutionQueue
+from services import cpu_pool
+from services.llm_scheduler import llm_caller, INTERACTIVE, BATCH
+from services.profiler import profiling, should_profile, MongoCommandSpans
+
+# Import job fetcher registry (scrapers are imported on first use)
+from services.job_fetchers.registry import FetcherRegistry
 
 # Import workflow
 from langgraph.workflow import JobMatcherWorkflow
@@ -45,31 +51,65 @@ logger = logging.getLogger(__name__)
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# The listener puts Mongo commands on the timeline of profiled executions
+client = AsyncIOMotorClient(mongo_url, event_listeners=[MongoCommandSpans()])
 db = client[os.environ['DB_NAME']]
 
 # Initialize services
 resume_parser = ResumeParser()
 job_matcher = JobMatcher()
 email_service = EmailService()
+job_catalog = JobCatalog(db)
+
+# Initialize job fetchers (builtin sources plus `job_matcher.fetchers` entry points)
+job_fetchers = FetcherRegistry()
+
+job_enricher = JobEnricher(
+    job_fetchers,
+    job_catalog,
+    max_per_host=int(os.environ.get('ENRICH_MAX_PER_HOST', '2')),
+    max_jobs_per_run=int(os.environ.get('ENRICH_MAX_JOBS_PER_RUN', '20'))
+)
+
+# Per-user dashboard summaries, refreshed when workflow and delta runs finish
+match_summaries = MatchSummaries(db, top_n=int(os.environ.get('SUMMARY_TOP_MATCHES', '20')))
 
-# Initialize job fetchers
-job_fetchers = {
-    "linkedin": LinkedInScraper(),
-    "indeed": IndeedScraper(),
-    "jobrights": JobrightsScraper(),
-    "startups_gallery": StartupsGalleryScraper(),
-    "briansjobs": BriansJobsScraper(),
-    "glassdoor": GlassdoorScraper(),
-    "ycombinator": YCombinatorScraper(),
-    "wellfound": WellfoundScraper()
-}
+delta_matcher = DeltaMatcher(db, job_catalog, job_matcher, match_summaries=match_summaries)
+
+# Coordination between replicas: named leases for singleton background work
+# and atomic claiming of queued executions
+REPLICA_ID = replica_id()
+leases = LeaseManager(db, owner=REPLICA_ID, ttl_seconds=float(os.environ.get('LEASE_TTL_SECONDS', '60')))
+execution_queue = ExecutionQueue(
+    db,
+    owner=REPLICA_ID,
+    lease_seconds=float(os.environ.get('EXECUTION_LEASE_SECONDS', '120')),
+    max_attempts=int(os.environ.get('EXECUTION_MAX_ATTEMPTS', '3'))
+)
+DELTA_LEASE = "delta-matching"
+
+# Parses resumes in the background right after upload
+resume_processor = ResumeProcessor(db, resume_parser)
+
+# Bulk onboarding: text extraction in the CPU pool, parsing queued at batch priority
+resume_importer = ResumeImporter(
+    db,
+    resume_processor,
+    batch_size=int(os.environ.get('IMPORT_BATCH_SIZE', '50')),
+    max_files=int(os.environ.get('IMPORT_MAX_FILES', '1000')),
+    max_file_bytes=int(float(os.environ.get('IMPORT_MAX_FILE_MB', '10')) * 1024 * 1024),
+    max_total_bytes=int(float(os.environ.get('IMPORT_MAX_TOTAL_MB', '500')) * 1024 * 1024)
+)
 
 # Initialize workflow
-workflow = JobMatcherWorkflow(db, resume_parser, job_matcher, email_service, job_fetchers)
+workflow = JobMatcherWorkflow(
+    db, resume_parser, job_matcher, email_service, job_fetchers, job_catalog, job_enricher,
+    resume_processor=resume_processor
+)
 
 # Create the main app without a prefix
-app = FastAPI(title="Job Matcher AI", version="1.0.0")
+# orjson serializes datetimes and JobRecord dataclasses natively
+app = FastAPI(title="Job Matcher AI", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -124,6 +164,9 @@ async def upload_resume(
         
         await db.resumes.insert_one(resume_dict)
         
+        # Extract skills now so the first workflow run doesn't wait on Gemini
+        resume_processor.schedule(resume_dict)
+        
         logger.info(f"Resume uploaded for user: {user_email}")
         return resume
         
@@ -132,6 +175,35 @@ async def upload_resume(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@api_router.post("/resume/bulk-import", status_code=202)
+async def bulk_import_resumes(
+    owner_email: str = Form(...),
+    files: List[UploadFile] = File(...)
+):
+    """Import many resumes (PDF/text files or zip archives) in the background.
+    
+    Returns the import record; poll /resume/imports/{id} for per-file status.
+    """
+    try:
+        # Hand over the spooled files; the importer checks sizes before reading anything
+        uploads = [(file.filename or "upload", file.file) for file in files]
+        record = await resume_importer.start(owner_email, uploads)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    logger.info(f"Resume import {record['id']} started for {owner_email}: {record['total']} files")
+    return record
+
+
+@api_router.get("/resume/imports/{import_id}")
+async def get_resume_import(import_id: str):
+    """Get a bulk import's progress, with extraction and parsing status per file"""
+    record = await resume_importer.get(import_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return record
+
+
 @api_router.get("/resume/{resume_id}", response_model=Resume)
 async def get_resume(resume_id: str):
     """Get resume by ID"""
@@ -150,7 +222,7 @@ async def get_resume(resume_id: str):
 @api_router.get("/resume/user/{user_email}")
 async def get_user_resumes(user_email: str):
     """Get all resumes for a user"""
-    resumes = await db.resumes.find({"user_id": user_email}, {"_id": 0}).to_list(100)
+    resumes = await db.resumes.find({"user_id": user_email}, {"_id": 0, "skill_embedding": 0}).to_list(100)
     
     # Convert datetime fields
     from datetime import datetime
@@ -161,87 +233,181 @@ async def get_user_resumes(user_email: str):
     return resumes
 
 
+async def run_execution(execution_id: str, request: WorkflowRequest, user_email: str, started_at: str,
+                        priority: int = INTERACTIVE) -> Dict:
+    """Run the workflow for a stored execution record, profiling it when requested or sampled"""
+    with profiling(should_profile(request.profile)) as profile:
+        result = await _run_workflow(execution_id, request, user_email, started_at, priority)
+    
+    if profile is not None:
+        result["profile_id"] = await save_profile(execution_id, user_email, profile)
+    return result
+
+
+async def save_profile(execution_id: str, user_email: str, profile) -> str:
+    """Store a profile in workflow_profiles and link it from the execution record"""
+    import uuid
+    from datetime import datetime, timezone
+    profile_id = str(uuid.uuid4())
+    await db.workflow_profiles.insert_one({
+        "id": profile_id,
+        "execution_id": execution_id,
+        "user_id": user_email,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        **profile.to_document()
+    })
+    await db.workflow_executions.update_one({"id": execution_id}, {"$set": {"profile_id": profile_id}})
+    logger.info(f"Stored profile {profile_id} for execution {execution_id}")
+    return profile_id
+
+
+async def _run_workflow(execution_id: str, request: WorkflowRequest, user_email: str, started_at: str,
+                        priority: int) -> Dict:
+    """Run the workflow and persist its outcome (execution record, matches, summary)"""
+    # Prepare initial state
+    initial_state = {
+        "user_id": user_email,
+        "resume_id": request.resume_id,
+        "resume_data": {},
+        "job_sources": request.job_sources,
+        "all_jobs": [],
+        "scored_jobs": [],
+        "matched_jobs": [],
+        "send_email": request.send_email,
+        "llm_budget": {
+            "max_calls": request.llm_max_calls,
+            "max_tokens": request.llm_max_tokens,
+            "max_seconds": request.llm_max_seconds
+        },
+        "llm_usage": {},
+        "preferences": request.preferences.model_dump(),
+        "filter_report": {},
+        "user_email": user_email,
+        "status": "started",
+        "error": ""
+    }
+    
+    # Run workflow
+    logger.info(f"Starting workflow for user: {user_email}")
+    with llm_caller(user_email, priority):
+        result = await workflow.run(initial_state)
+    
+    # Update execution record
+    from datetime import datetime, timezone
+    completed_at = datetime.now(timezone.utc).isoformat()
+    await db.workflow_executions.update_one(
+        {"id": execution_id},
+        {"$set": {
+            "status": result["status"],
+            "jobs_found": len(result.get("all_jobs", [])),
+            "jobs_matched": len(result.get("matched_jobs", [])),
+            "email_sent": result.get("status") == "completed",
+            "error_message": result.get("error", ""),
+            "llm_usage": result.get("llm_usage", {}),
+            "filter_report": result.get("filter_report", {}),
+            "completed_at": completed_at
+        }}
+    )
+    
+    # Store matched jobs in database
+    if result.get("matched_jobs"):
+        await db.job_matches.insert_many([
+            job_match_document(user_email, job, completed_at, resume_id=request.resume_id)
+            for job in result["matched_jobs"]
+        ])
+    
+    # Refresh the user's dashboard summary
+    await match_summaries.record(user_email, result.get("matched_jobs", []), completed_at, execution={
+        "execution_id": execution_id,
+        "status": result["status"],
+        "jobs_found": len(result.get("all_jobs", [])),
+        "jobs_matched": len(result.get("matched_jobs", [])),
+        "error_message": result.get("error", ""),
+        "started_at": started_at,
+        "completed_at": completed_at
+    })
+    
+    logger.info(f"Workflow completed: {result['status']} - {len(result.get('matched_jobs', []))} jobs matched")
+    return result
+
+
+async def run_queued_execution(execution: Dict):
+    """Worker entry point for an execution claimed from the queue (nobody is waiting on it)"""
+    await run_execution(
+        execution["id"], WorkflowRequest(**execution["workflow_config"]), execution["user_id"], execution["started_at"],
+        priority=BATCH
+    )
+
+
+async def create_execution(request: WorkflowRequest, user_email: str, status: str) -> Dict:
+    """Validate the resume and store a new execution record"""
+    resume = await db.resumes.find_one({"id": request.resume_id}, {"_id": 1})
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    execution = WorkflowExecution(
+        user_id=user_email,
+        workflow_config=request.model_dump(),
+        status=status
+    )
+    
+    execution_dict = execution.model_dump()
+    execution_dict['started_at'] = execution_dict['started_at'].isoformat()
+    await db.workflow_executions.insert_one(execution_dict)
+    execution_dict.pop('_id', None)
+    return execution_dict
+
+
 @api_router.post("/workflow/execute")
 async def execute_workflow(request: WorkflowRequest, user_email: str):
     """Execute job matching workflow"""
+    execution = await create_execution(request, user_email, status="running")
     try:
-        # Validate resume exists
-        resume = await db.resumes.find_one({"id": request.resume_id}, {"_id": 0})
-        if not resume:
-            raise HTTPException(status_code=404, detail="Resume not found")
-        
-        # Create workflow execution record
-        execution = WorkflowExecution(
-            user_id=user_email,
-            workflow_config=request.model_dump(),
-            status="running"
-        )
-        
-        execution_dict = execution.model_dump()
-        execution_dict['started_at'] = execution_dict['started_at'].isoformat()
-        await db.workflow_executions.insert_one(execution_dict)
-        
-        # Prepare initial state
-        initial_state = {
-            "user_id": user_email,
-            "resume_id": request.resume_id,
-            "resume_data": {},
-            "job_sources": request.job_sources,
-            "all_jobs": [],
-            "matched_jobs": [],
-            "send_email": request.send_email,
-            "user_email": user_email,
-            "status": "started",
-            "error": ""
-        }
+        result = await run_execution(execution["id"], request, user_email, execution["started_at"])
         
-        # Run workflow
-        logger.info(f"Starting workflow for user: {user_email}")
-        result = await workflow.run(initial_state)
-        
-        # Update execution record
-        from datetime import datetime, timezone
-        await db.workflow_executions.update_one(
-            {"id": execution.id},
-            {"$set": {
-                "status": result["status"],
-                "jobs_found": len(result.get("all_jobs", [])),
-                "jobs_matched": len(result.get("matched_jobs", [])),
-                "email_sent": result.get("status") == "completed",
-                "error_message": result.get("error", ""),
-                "completed_at": datetime.now(timezone.utc).isoformat()
-            }}
-        )
-        
-        # Store matched jobs in database
-        if result.get("matched_jobs"):
-            for job in result["matched_jobs"]:
-                job_match = JobMatch(
-                    user_id=user_email,
-                    job_id=job.get("job_id", "unknown"),
-                    match_score=job.get("match_score", 0),
-                    match_reason=job.get("match_reason", "")
-                )
-                job_match_dict = job_match.model_dump()
-                job_match_dict['matched_at'] = job_match_dict['matched_at'].isoformat()
-                await db.job_matches.insert_one(job_match_dict)
-        
-        logger.info(f"Workflow completed: {result['status']} - {len(result.get('matched_jobs', []))} jobs matched")
-        
-        return {
-            "execution_id": execution.id,
+        # Return the job records directly so orjson serializes them without
+        # going through jsonable_encoder
+        return ORJSONResponse({
+            "execution_id": execution["id"],
             "status": result["status"],
             "jobs_found": len(result.get("all_jobs", [])),
             "jobs_matched": len(result.get("matched_jobs", [])),
             "matched_jobs": result.get("matched_jobs", []),
+            "llm_usage": result.get("llm_usage", {}),
+            "filter_report": result.get("filter_report", {}),
+            "profile_id": result.get("profile_id"),
             "error": result.get("error", "")
-        }
+        })
         
     except Exception as e:
         logger.error(f"Error executing workflow: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@api_router.post("/workflow/enqueue")
+async def enqueue_workflow(request: WorkflowRequest, user_email: str):
+    """Queue a workflow execution for the next free worker replica"""
+    execution = await create_execution(request, user_email, status="queued")
+    logger.info(f"Workflow queued for user: {user_email}")
+    return {"execution_id": execution["id"], "status": execution["status"]}
+
+
+@api_router.post("/workflow/delta")
+async def execute_delta_matching(user_email: Optional[str] = None):
+    """Score jobs added to the catalog since the last run against active resumes"""
+    try:
+        # One delta run at a time across replicas
+        async with leases.hold(DELTA_LEASE) as lease:
+            if lease is None:
+                return {"status": "skipped", "reason": "delta matching is already running on another replica"}
+            result = await delta_matcher.run(user_ids=[user_email] if user_email else None)
+        logger.info(f"Delta matching: {result}")
+        return result
+    except Exception as e:
+        logger.error(f"Error running delta matching: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @api_router.get("/workflow/execution/{execution_id}")
 async def get_workflow_execution(execution_id: str):
     """Get workflow execution status"""
@@ -251,6 +417,21 @@ async def get_workflow_execution(execution_id: str):
     return execution
 
 
+@api_router.get("/workflow/execution/{execution_id}/profile")
+async def get_workflow_profile(execution_id: str):
+    """Get the profile captured for an execution (sampled stacks and span timeline)"""
+    profile = await db.workflow_profiles.find_one({"execution_id": execution_id}, {"_id": 0})
+    if not profile:
+        raise HTTPException(status_code=404, detail="No profile for this execution")
+    return profile
+
+
+@api_router.get("/jobs/summary/{user_email}")
+async def get_match_summary(user_email: str):
+    """Get a user's top current matches, per-source counts and last execution"""
+    return await match_summaries.get(user_email)
+
+
 @api_router.get("/jobs/matches/{user_email}")
 async def get_job_matches(user_email: str, limit: int = 50):
     """Get all job matches for a user"""
@@ -258,6 +439,19 @@ async def get_job_matches(user_email: str, limit: int = 50):
     return matches
 
 
+@api_router.get("/jobs/candidates/{resume_id}")
+async def get_job_candidates(resume_id: str, limit: int = 50, method: str = "skills"):
+    """Get stored jobs for a parsed resume, ranked by skill overlap or embedding similarity"""
+    resume = await db.resumes.find_one({"id": resume_id}, {"_id": 0})
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    if method == "embedding":
+        return await workflow.shortlist_from_catalog(resume, k=limit)
+    if method != "skills":
+        raise HTTPException(status_code=400, detail="method must be 'skills' or 'embedding'")
+    return await job_catalog.find_candidates(resume, limit=limit)
+
+
 @api_router.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -284,6 +478,71 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def open_embedding_index():
+    """Open the job embedding index at startup rather than on import, so
+    importing the app doesn't touch the index directory"""
+    from services.embedding_index import EmbeddingIndex, HashingEmbedder
+    
+    embedder = HashingEmbedder()
+    embedding_index = await asyncio.to_thread(
+        EmbeddingIndex,
+        os.environ.get('EMBEDDING_INDEX_DIR', str(ROOT_DIR / 'data' / 'embeddings')),
+        dim=embedder.dim
+    )
+    workflow.embedding_index = embedding_index
+    workflow.embedder = embedder
+    resume_processor.embedder = embedder
+
+
+@app.on_event("startup")
+async def create_indexes():
+    await job_catalog.ensure_indexes()
+    await match_summaries.ensure_indexes()
+    await leases.ensure_indexes()
+    await resume_importer.ensure_indexes()
+    await execution_queue.ensure_indexes()
+    await db.workflow_profiles.create_index("execution_id")
+    await db.job_matches.create_index([("user_id", 1), ("job_fingerprint", 1)])
+    await db.resumes.create_index("last_matched_at")
+    await db.resumes.create_index("text_fingerprint")
+
+
+async def scheduled_delta_matching(interval: float):
+    """Run delta matching every `interval` seconds on whichever replica holds the lease"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with leases.hold(DELTA_LEASE) as lease:
+                if lease is not None:
+                    result = await delta_matcher.run()
+                    logger.info(f"Scheduled delta matching: {result}")
+        except Exception as e:
+            logger.error(f"Error in scheduled delta matching: {str(e)}")
+
+
+background_tasks: List[asyncio.Task] = []
+
+
+@app.on_event("startup")
+async def start_background_workers():
+    # Opt-in per replica, so API-only nodes can be scaled separately
+    if os.environ.get('EXECUTION_WORKER', '').lower() in ('1', 'true', 'yes'):
+        background_tasks.append(asyncio.create_task(execution_queue.work(
+            run_queued_execution,
+            concurrency=int(os.environ.get('EXECUTION_WORKER_CONCURRENCY', '2')),
+            poll_interval=float(os.environ.get('EXECUTION_POLL_SECONDS', '2'))
+        )))
+        logger.info(f"Execution worker started on replica {REPLICA_ID}")
+    
+    delta_interval = float(os.environ.get('DELTA_INTERVAL_SECONDS', '0'))
+    if delta_interval > 0:
+        background_tasks.append(asyncio.create_task(scheduled_delta_matching(delta_interval)))
+
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    for task in background_tasks:
+        task.cancel()
+    client.close()
+    cpu_pool.shutdown()
\ No newline at end of file
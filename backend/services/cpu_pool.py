@@ -0,0 +1,39 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Callable, Any
+
+from services.profiler import span
+
+# Shared pool for CPU-bound work (HTML parsing, PDF text extraction) so it runs
+# on all cores instead of blocking the event loop thread.
+_executor = None
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        workers = int(os.getenv("CPU_POOL_WORKERS", "0")) or os.cpu_count() or 1
+        # "spawn" avoids forking a process that already runs an event loop and threads
+        _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+async def run_cpu_bound(fn: Callable, *args) -> Any:
+    """Run a picklable module-level function in the shared process pool"""
+    global _executor
+    loop = asyncio.get_running_loop()
+    with span("cpu", fn.__name__):
+        try:
+            return await loop.run_in_executor(get_executor(), partial(fn, *args))
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM); replace the pool and run this call in a thread
+            _executor = None
+            return await asyncio.to_thread(fn, *args)
+
+def shutdown():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,138 @@
+from datetime import datetime, timezone
+from typing import List, Dict, Optional
+
+from pymongo import UpdateOne
+
+from models.job import JobRecord, job_match_document
+from services.llm_budget import LLMBudget
+from services.llm_scheduler import llm_caller, BATCH
+
+# Scheduler identity for job-centric prompts, which serve many users at once
+DIGEST_CALLER = "delta-digest"
+
+class DeltaMatcher:
+    """Incremental matching: score only catalog jobs that are new for each resume.
+    
+    Every resume that has been through a workflow carries a `last_matched_at`
+    watermark (the `first_seen_at` of the newest catalog job it has been
+    scored against). A delta run loads the jobs stored since the oldest active
+    watermark once, scores each resume against just the jobs past its own
+    watermark, upserts the matches into `job_matches` and advances the
+    watermark. Cost grows with new postings, not with the size of the catalog,
+    and one LLM budget (env defaults) covers the whole run. When there are
+    more users to update than distinct new postings, scoring switches to
+    job-centric prompts (JobMatcher.match_candidates). New matches are also
+    folded into each user's summary when `match_summaries` is given.
+    """
+    
+    def __init__(self, db, job_catalog, job_matcher, max_jobs_per_run: int = 500, match_summaries=None):
+        self.db = db
+        self.job_catalog = job_catalog
+        self.job_matcher = job_matcher
+        self.max_jobs_per_run = max_jobs_per_run
+        self.match_summaries = match_summaries
+    
+    async def active_resumes(self, user_ids: Optional[List[str]] = None) -> List[Dict]:
+        """Parsed resumes that have a watermark, i.e. have been matched before"""
+        query = {"last_matched_at": {"$exists": True}, "parsed_skills.0": {"$exists": True}}
+        if user_ids:
+            query["user_id"] = {"$in": user_ids}
+        return await self.db.resumes.find(query, {"_id": 0, "resume_text": 0, "skill_embedding": 0}).to_list(None)
+    
+    async def run(self, user_ids: Optional[List[str]] = None) -> Dict:
+        """Score new catalog jobs against active resumes and merge the matches"""
+        resumes = await self.active_resumes(user_ids)
+        if not resumes:
+            return {"resumes": 0, "new_jobs": 0, "jobs_scored": 0, "matches": 0}
+        
+        oldest_watermark = min(resume["last_matched_at"] for resume in resumes)
+        new_jobs = await self.job_catalog.find_since(oldest_watermark, limit=self.max_jobs_per_run)
+        
+        deltas = {
+            resume["id"]: [doc for doc in new_jobs if doc["first_seen_at"] > resume["last_matched_at"]]
+            for resume in resumes
+        }
+        pending = [resume for resume in resumes if deltas[resume["id"]]]
+        distinct_jobs = {doc["fingerprint"] for resume in pending for doc in deltas[resume["id"]]}
+        
+        budget = LLMBudget.from_limits()
+        # With more users than postings, score each posting once against a
+        # batch of candidates instead of re-sending it once per user
+        if len(pending) > len(distinct_jobs):
+            mode = "job"
+            scored = await self._score_by_job(pending, deltas, budget)
+        else:
+            mode = "resume"
+            scored = await self._score_by_resume(pending, deltas, budget)
+        
+        jobs_scored = 0
+        matches = 0
+        for resume in pending:
+            delta = deltas[resume["id"]]
+            matched = self.job_matcher.select_matches(scored[resume["id"]])
+            await self.merge_matches(resume, matched)
+            if matched and self.match_summaries is not None:
+                await self.match_summaries.record(resume["user_id"], matched)
+            await self.advance_watermark(resume["id"], delta[-1]["first_seen_at"])
+            jobs_scored += len(delta)
+            matches += len(matched)
+        
+        return {"resumes": len(resumes), "new_jobs": len(new_jobs), "jobs_scored": jobs_scored, "matches": matches,
+                "mode": mode, "llm_usage": budget.summary()}
+    
+    async def _score_by_resume(self, resumes: List[Dict], deltas: Dict[str, List[Dict]], budget: LLMBudget) -> Dict[str, List[JobRecord]]:
+        """One user at a time, batches of that user's new jobs per prompt"""
+        scored = {}
+        for resume in resumes:
+            # Digest work yields to interactive requests in the LLM scheduler
+            with llm_caller(resume["user_id"], BATCH):
+                scored[resume["id"]] = await self.job_matcher.match_jobs(self._resume_profile(resume), [
+                    JobRecord.from_document(doc) for doc in deltas[resume["id"]]
+                ], budget=budget)
+        return scored
+    
+    async def _score_by_job(self, resumes: List[Dict], deltas: Dict[str, List[Dict]], budget: LLMBudget) -> Dict[str, List[JobRecord]]:
+        """One posting at a time, scored against every user it is new for"""
+        candidates_by_job: Dict[str, tuple] = {}
+        for resume in resumes:
+            for doc in deltas[resume["id"]]:
+                candidates_by_job.setdefault(doc["fingerprint"], (doc, []))[1].append(resume)
+        
+        scored = {resume["id"]: [] for resume in resumes}
+        for doc, candidates in candidates_by_job.values():
+            with llm_caller(DIGEST_CALLER, BATCH):
+                jobs = await self.job_matcher.match_candidates(
+                    JobRecord.from_document(doc), [self._resume_profile(resume) for resume in candidates], budget=budget
+                )
+            for resume, job in zip(candidates, jobs):
+                scored[resume["id"]].append(job)
+        return scored
+    
+    async def merge_matches(self, resume: Dict, matched: List[JobRecord]):
+        """Upsert matches keyed by (user, job fingerprint) so re-scored jobs don't duplicate"""
+        if not matched:
+            return
+        
+        matched_at = datetime.now(timezone.utc).isoformat()
+        operations = []
+        for job in matched:
+            doc = job_match_document(resume["user_id"], job, matched_at, resume_id=resume["id"])
+            operations.append(UpdateOne(
+                {"user_id": doc["user_id"], "job_fingerprint": doc["job_fingerprint"]},
+                {
+                    "$set": {k: doc[k] for k in ("resume_id", "match_score", "match_reason", "scorer", "matched_at")},
+                    "$setOnInsert": {"id": doc["id"], "job_id": doc["job_id"]}
+                },
+                upsert=True
+            ))
+        await self.db.job_matches.bulk_write(operations, ordered=False)
+    
+    async def advance_watermark(self, resume_id: str, watermark: datetime):
+        await self.db.resumes.update_one({"id": resume_id}, {"$max": {"last_matched_at": watermark}})
+    
+    def _resume_profile(self, resume: Dict) -> Dict:
+        return {
+            "skills": resume.get("parsed_skills", []),
+            "experience": resume.get("parsed_experience", ""),
+            "expertise": resume.get("expertise", [])
+        }
@@ -2,7 +2,10 @@ import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import os
-from typing import List, Dict
+from typing import List
+
+from models.job import JobRecord
+from services.profiler import span
 
 class EmailService:
     def __init__(self):
@@ -11,7 +14,7 @@ class EmailService:
         self.sender_email = os.getenv("GMAIL_EMAIL")
         self.sender_password = os.getenv("GMAIL_APP_PASSWORD")
     
-    async def send_job_matches_email(self, recipient_email: str, matched_jobs: List[Dict]):
+    async def send_job_matches_email(self, recipient_email: str, matched_jobs: List[JobRecord]):
         """Send email with matched jobs"""
         if not self.sender_email or not self.sender_password:
             raise Exception("Gmail credentials not configured in .env file")
@@ -28,31 +31,32 @@ class EmailService:
         message.attach(html_part)
         
         try:
-            await aiosmtplib.send(
-                message,
-                hostname=self.smtp_host,
-                port=self.smtp_port,
-                start_tls=True,
-                username=self.sender_email,
-                password=self.sender_password,
-            )
+            with span("smtp", self.smtp_host):
+                await aiosmtplib.send(
+                    message,
+                    hostname=self.smtp_host,
+                    port=self.smtp_port,
+                    start_tls=True,
+                    username=self.sender_email,
+                    password=self.sender_password,
+                )
             return True
         except Exception as e:
             raise Exception(f"Failed to send email: {str(e)}")
     
-    def _create_email_html(self, matched_jobs: List[Dict]) -> str:
+    def _create_email_html(self, matched_jobs: List[JobRecord]) -> str:
         """Create HTML content for email"""
         jobs_html = ""
         for idx, job in enumerate(matched_jobs, 1):
             jobs_html += f"""
             <div style="background: #f9fafb; border-left: 4px solid #3b82f6; padding: 20px; margin-bottom: 20px; border-radius: 8px;">
-                <h3 style="color: #1f2937; margin: 0 0 10px 0;">{idx}. {job['title']}</h3>
-                <p style="color: #6b7280; margin: 5px 0;"><strong>Company:</strong> {job['company']}</p>
-                <p style="color: #6b7280; margin: 5px 0;"><strong>Location:</strong> {job.get('location', 'Not specified')}</p>
-                <p style="color: #6b7280; margin: 5px 0;"><strong>Source:</strong> {job['source'].title()}</p>
-                <p style="color: #10b981; margin: 5px 0;"><strong>Match Score:</strong> {job.get('match_score', 0):.0f}%</p>
-                <p style="color: #4b5563; margin: 10px 0;"><strong>Why it matches:</strong> {job.get('match_reason', 'Good fit based on your profile')}</p>
-                <a href="{job['url']}" style="display: inline-block; background: #3b82f6; color: white; padding: 10px 20px; text-decoration: none; border-radius: 6px; margin-top: 10px;">View Job</a>
+                <h3 style="color: #1f2937; margin: 0 0 10px 0;">{idx}. {job.title}</h3>
+                <p style="color: #6b7280; margin: 5px 0;"><strong>Company:</strong> {job.company}</p>
+                <p style="color: #6b7280; margin: 5px 0;"><strong>Location:</strong> {job.location or 'Not specified'}</p>
+                <p style="color: #6b7280; margin: 5px 0;"><strong>Source:</strong> {job.source.title()}</p>
+                <p style="color: #10b981; margin: 5px 0;"><strong>Match Score:</strong> {job.match_score or 0:.0f}%</p>
+                <p style="color: #4b5563; margin: 10px 0;"><strong>Why it matches:</strong> {job.match_reason or 'Good fit based on your profile'}</p>
+                <a href="{job.url}" style="display: inline-block; background: #3b82f6; color: white; padding: 10px 20px; text-decoration: none; border-radius: 6px; margin-top: 10px;">View Job</a>
             </div>
             """
         
@@ -0,0 +1,188 @@
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Tuple, Iterable
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; appends are then only safe within one process
+    fcntl = None
+
+from models.job import JobRecord
+from services.skill_tokens import extract_skill_tokens, extract_skill_tokens_from_list, extract_known_skill_tokens
+
+class HashingEmbedder:
+    """Deterministic local text embedding using the hashing trick.
+    
+    Skill tokens are hashed (blake2b, so every process agrees) into `dim`
+    signed buckets and the vector is L2-normalized, which makes a dot product
+    equal to cosine similarity. No model download and no LLM round-trip.
+    """
+    
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+    
+    def _bucket(self, token: str) -> Tuple[int, float]:
+        digest = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+        return digest % self.dim, 1.0 if (digest >> 63) & 1 else -1.0
+    
+    def embed_tokens(self, weighted_tokens: Iterable[Tuple[str, float]]) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token, weight in weighted_tokens:
+            index, sign = self._bucket(token)
+            vector[index] += sign * weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def embed_job(self, job: JobRecord) -> np.ndarray:
+        """Embed a job's title words and the known skills in its description,
+        the same tokens the catalog indexes"""
+        title_tokens = extract_skill_tokens(job.title)
+        description_tokens = [t for t in extract_known_skill_tokens(job.description) if t not in title_tokens]
+        return self.embed_tokens([(t, 2.0) for t in title_tokens] + [(t, 1.0) for t in description_tokens])
+    
+    def embed_resume(self, resume_data: Dict) -> np.ndarray:
+        """Embed a resume document (parsed_skills / expertise)"""
+        skill_tokens = extract_skill_tokens_from_list(resume_data.get("parsed_skills", []))
+        expertise_tokens = [
+            t for t in extract_skill_tokens_from_list(resume_data.get("expertise", []))
+            if t not in skill_tokens
+        ]
+        return self.embed_tokens([(t, 2.0) for t in skill_tokens] + [(t, 1.0) for t in expertise_tokens])
+
+
+class EmbeddingIndex:
+    """Append-only float32 matrix of job vectors, searched through np.memmap.
+    
+    `vectors.f32` holds one row per job and `ids.txt` is the sidecar with one
+    job fingerprint per line (line number == row). Every worker maps the same
+    file, so the OS page cache holds a single copy however many processes
+    search it. Writers append under an exclusive file lock, vectors first, so
+    a reader never sees an id without its row. The id sidecar is the source
+    of truth for the row count: a writer that died between the two appends
+    leaves rows (or a partial id line) past it, which the next writer, or
+    the next process to open the index, truncates away under the lock.
+    """
+    
+    def __init__(self, directory: str, dim: int = 512, chunk_rows: int = 65536):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        self.chunk_rows = chunk_rows
+        self.vectors_path = self.directory / "vectors.f32"
+        self.ids_path = self.directory / "ids.txt"
+        self.lock_path = self.directory / "index.lock"
+        self.ids_path.touch(exist_ok=True)
+        self.vectors_path.touch(exist_ok=True)
+        
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._ids_offset = 0  # Bytes of ids.txt already loaded
+        self._matrix = None
+        self._lock = threading.Lock()
+        
+        with self._exclusive():
+            self._refresh()
+            self._truncate_orphans()
+    
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._ids)
+    
+    def __contains__(self, job_id: str) -> bool:
+        self._refresh()
+        return job_id in self._rows
+    
+    def _refresh(self):
+        """Pick up rows appended by this or another process since the last call"""
+        with self._lock:
+            size = self.ids_path.stat().st_size
+            if size == self._ids_offset:
+                return
+            with open(self.ids_path, "rb") as f:
+                f.seek(self._ids_offset)
+                data = f.read(size - self._ids_offset)
+            # Only consume complete lines
+            data = data[:data.rfind(b"\n") + 1]
+            for line in data.decode("utf-8").splitlines():
+                self._rows[line] = len(self._ids)
+                self._ids.append(line)
+            self._ids_offset += len(data)
+            self._matrix = None
+    
+    def _open_matrix(self):
+        if self._matrix is None and self._ids:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(len(self._ids), self.dim))
+        return self._matrix
+    
+    @contextmanager
+    def _exclusive(self):
+        """Hold the index's cross-process write lock"""
+        with open(self.lock_path, "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+    
+    def _truncate_orphans(self):
+        """Cut both files back to the ids loaded by _refresh (call under _exclusive)"""
+        if self.ids_path.stat().st_size > self._ids_offset:
+            os.truncate(self.ids_path, self._ids_offset)
+        row_bytes = len(self._ids) * self.dim * np.dtype(np.float32).itemsize
+        if self.vectors_path.stat().st_size > row_bytes:
+            os.truncate(self.vectors_path, row_bytes)
+    
+    def add(self, ids: List[str], vectors: np.ndarray) -> int:
+        """Append vectors for ids not yet in the index. Returns how many were added."""
+        with self._exclusive():
+            self._refresh()
+            new_rows = [i for i, job_id in enumerate(ids) if job_id not in self._rows]
+            new_rows = list({ids[i]: i for i in new_rows}.values())  # De-duplicate within the call
+            if not new_rows:
+                return 0
+            
+            self._truncate_orphans()
+            with open(self.vectors_path, "ab") as f:
+                f.write(np.ascontiguousarray(vectors[new_rows], dtype=np.float32).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self.ids_path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{ids[i]}\n" for i in new_rows))
+            self._refresh()
+            return len(new_rows)
+    
+    def search(self, query: np.ndarray, k: int = 50) -> List[Tuple[str, float]]:
+        """Top-k rows by cosine similarity to `query` (vectors are normalized)"""
+        self._refresh()
+        matrix = self._open_matrix()
+        if matrix is None or k <= 0:
+            return []
+        
+        query = np.asarray(query, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        
+        # Scan in chunks so a huge matrix never has to be resident at once
+        for start in range(0, matrix.shape[0], self.chunk_rows):
+            scores = matrix[start:start + self.chunk_rows] @ query
+            if len(scores) > k:
+                top = np.argpartition(scores, -k)[-k:]
+            else:
+                top = np.arange(len(scores))
+            best_rows = np.concatenate([best_rows, top + start])
+            best_scores = np.concatenate([best_scores, scores[top]])
+            if len(best_scores) > k:
+                keep = np.argpartition(best_scores, -k)[-k:]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+        
+        order = np.argsort(-best_scores)
+        return [(self._ids[best_rows[i]], float(best_scores[i])) for i in order if best_scores[i] > 0]
+    
+    def add_jobs(self, jobs: List[JobRecord], embedder: HashingEmbedder) -> int:
+        if not jobs:
+            return 0
+        vectors = np.stack([embedder.embed_job(job) for job in jobs])
+        return self.add([job.fingerprint for job in jobs], vectors)
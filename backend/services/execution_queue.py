@@ -0,0 +1,119 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Optional
+
+from pymongo import ReturnDocument
+
+from services.leases import replica_id
+
+class ExecutionQueue:
+    """Queued workflow executions, claimed atomically by worker replicas.
+    
+    `/workflow/enqueue` stores an execution with status "queued". Workers
+    claim the oldest one with `find_one_and_update`, which flips it to
+    "running" and stamps `claimed_by` and a `lease_expires_at` deadline, so
+    exactly one replica runs it. The worker heartbeats the deadline while the
+    workflow runs; an execution whose deadline passed (its replica died) is
+    claimed again, up to `max_attempts` times, after which `claim` marks it
+    failed.
+    """
+    
+    def __init__(self, db, owner: Optional[str] = None, lease_seconds: float = 120, max_attempts: int = 3):
+        self.collection = db.workflow_executions
+        self.owner = owner or replica_id()
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+    
+    async def ensure_indexes(self):
+        await self.collection.create_index([("status", 1), ("started_at", 1)])
+    
+    async def claim(self) -> Optional[Dict]:
+        """Take the oldest queued (or abandoned) execution, or None if there is none"""
+        now = datetime.now(timezone.utc)
+        await self.collection.update_many(
+            {"status": "running", "lease_expires_at": {"$lt": now}, "attempts": {"$gte": self.max_attempts}},
+            {"$set": {
+                "status": "failed",
+                "error_message": f"Abandoned by its worker {self.max_attempts} times",
+                "completed_at": now.isoformat()
+            }}
+        )
+        return await self.collection.find_one_and_update(
+            {"$or": [
+                {"status": "queued"},
+                {"status": "running", "lease_expires_at": {"$lt": now}, "attempts": {"$lt": self.max_attempts}}
+            ]},
+            {
+                "$set": {
+                    "status": "running",
+                    "claimed_by": self.owner,
+                    "claimed_at": now.isoformat(),
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds)
+                },
+                "$inc": {"attempts": 1}
+            },
+            projection={"_id": 0},
+            sort=[("started_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+    
+    async def heartbeat(self, execution_id: str) -> bool:
+        """Extend the claim; False if another worker has taken the execution over"""
+        result = await self.collection.update_one(
+            {"id": execution_id, "claimed_by": self.owner, "status": "running"},
+            {"$set": {"lease_expires_at": datetime.now(timezone.utc) + timedelta(seconds=self.lease_seconds)}}
+        )
+        return result.matched_count == 1
+    
+    async def fail(self, execution_id: str, error: str):
+        await self.collection.update_one(
+            {"id": execution_id, "claimed_by": self.owner},
+            {"$set": {
+                "status": "failed",
+                "error_message": error,
+                "completed_at": datetime.now(timezone.utc).isoformat()
+            }}
+        )
+    
+    async def work(self, run: Callable[[Dict], Awaitable], concurrency: int = 1, poll_interval: float = 2.0):
+        """Claim and run executions until cancelled, `concurrency` at a time"""
+        running = set()
+        while True:
+            while len(running) < concurrency:
+                try:
+                    execution = await self.claim()
+                except Exception as e:
+                    print(f"Error claiming queued execution: {str(e)}")
+                    execution = None
+                if execution is None:
+                    break
+                task = asyncio.create_task(self._run(execution, run))
+                running.add(task)
+                task.add_done_callback(running.discard)
+            
+            try:
+                await asyncio.sleep(poll_interval)
+            except asyncio.CancelledError:
+                for task in running:
+                    task.cancel()
+                raise
+    
+    async def _run(self, execution: Dict, run: Callable[[Dict], Awaitable]):
+        heartbeat = asyncio.create_task(self._heartbeat(execution["id"]))
+        try:
+            await run(execution)
+        except Exception as e:
+            print(f"Error running queued execution {execution['id']}: {str(e)}")
+            await self.fail(execution["id"], str(e))
+        finally:
+            heartbeat.cancel()
+    
+    async def _heartbeat(self, execution_id: str):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                if not await self.heartbeat(execution_id):
+                    print(f"Execution {execution_id} was claimed by another worker")
+                    return
+            except Exception as e:
+                print(f"Error extending claim on execution {execution_id}: {str(e)}")
@@ -0,0 +1,178 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+class PageCache:
+    """On-disk HTTP response cache shared by the job scrapers.
+    
+    Entries are keyed by URL plus request headers. A fresh entry (younger than
+    `ttl_seconds`) is served without touching the network; a stale one is
+    revalidated with If-None-Match / If-Modified-Since so an unchanged page
+    costs only a 304. The directory is bounded to `max_bytes` by evicting the
+    least recently used entries (file mtime doubles as the access time), and
+    it can be shared by every worker process on the host.
+    
+    Each process only sees its own writes between scans, so the directory is
+    re-scanned every `rescan_seconds` and whenever this process has written
+    RESCAN_FRACTION of `max_bytes` since the last scan; that bounds how far
+    several workers can overshoot the limit together. Scans also remove temp
+    files left behind by writers that died mid-write.
+    """
+    
+    # Share of max_bytes a process may write before it re-scans the directory
+    RESCAN_FRACTION = 0.1
+    # Temp files older than this belong to a writer that died
+    ORPHAN_SECONDS = 300
+    
+    def __init__(self, cache_dir: str, ttl_seconds: float = 900, max_bytes: int = 64 * 1024 * 1024,
+                 rescan_seconds: float = 60):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.rescan_seconds = rescan_seconds
+        self._size = None  # Approximate bytes on disk, computed on first write
+        self._written_since_scan = 0
+        self._scanned_at = 0.0
+        self._lock = threading.Lock()  # Writes run concurrently in to_thread workers
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def _key(self, url: str, headers: Dict) -> str:
+        vary = "\n".join(f"{name.lower()}:{value}" for name, value in sorted((headers or {}).items()))
+        return hashlib.sha256(f"{url}\n{vary}".encode()).hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+    
+    def _read(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _touch(self, key: str):
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+    
+    def _write(self, key: str, entry: Dict):
+        data = json.dumps(entry).encode("utf-8")
+        path = self._path(key)
+        try:
+            previous_size = path.stat().st_size
+        except OSError:
+            previous_size = 0
+        
+        # Write to a temp file and rename so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        
+        with self._lock:
+            growth = len(data) - previous_size
+            if self._size is not None:
+                self._size += growth
+                self._written_since_scan += max(growth, 0)
+            if (self._size is None
+                    or self._size > self.max_bytes
+                    or self._written_since_scan > self.max_bytes * self.RESCAN_FRACTION
+                    or time.monotonic() - self._scanned_at > self.rescan_seconds):
+                self._scan()
+    
+    def _scan(self):
+        """Measure the directory, drop orphaned temp files and evict least
+        recently used entries until the cache fits in max_bytes (call with _lock held)"""
+        now = time.time()
+        for p in self.cache_dir.glob("*.tmp"):
+            try:
+                if now - p.stat().st_mtime > self.ORPHAN_SECONDS:
+                    p.unlink()
+            except OSError:
+                continue
+        
+        entries = []
+        for p in self.cache_dir.glob("*.json"):
+            try:
+                stat = p.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, p))
+        
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, p in entries:
+                if total <= self.max_bytes * 0.9:  # Leave headroom so we don't evict on every write
+                    break
+                try:
+                    p.unlink()
+                    total -= size
+                except OSError:
+                    continue
+        self._size = total
+        self._written_since_scan = 0
+        self._scanned_at = time.monotonic()
+    
+    async def get_text(self, session, url: str, headers: Dict = None, timeout: float = 10) -> Optional[str]:
+        """GET `url` through the cache. Returns the body, or None for non-200 responses."""
+        headers = headers or {}
+        key = self._key(url, headers)
+        entry = await asyncio.to_thread(self._read, key)
+        
+        if entry and time.time() - entry["stored_at"] < self.ttl_seconds:
+            await asyncio.to_thread(self._touch, key)
+            return entry["body"]
+        
+        request_headers = dict(headers)
+        if entry:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+        
+        async with session.get(url, headers=request_headers, timeout=timeout) as response:
+            if response.status == 304 and entry:
+                entry["stored_at"] = time.time()
+                await asyncio.to_thread(self._write, key, entry)
+                return entry["body"]
+            if response.status != 200:
+                return None
+            
+            body = await response.text()
+            if "no-store" not in response.headers.get("Cache-Control", ""):
+                await asyncio.to_thread(self._write, key, {
+                    "url": url,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "stored_at": time.time(),
+                    "body": body
+                })
+            return body
+
+_page_cache = None
+
+def get_page_cache() -> PageCache:
+    """Return the process-wide page cache, configured from the environment"""
+    global _page_cache
+    if _page_cache is None:
+        _page_cache = PageCache(
+            cache_dir=os.getenv("PAGE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "job_matcher_pages")),
+            ttl_seconds=float(os.getenv("PAGE_CACHE_TTL_SECONDS", "900")),
+            max_bytes=int(float(os.getenv("PAGE_CACHE_MAX_MB", "64")) * 1024 * 1024)
+        )
+    return _page_cache
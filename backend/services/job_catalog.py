@@ -0,0 +1,151 @@
+from datetime import datetime, timezone
+from typing import List, Dict
+
+from pymongo import UpdateOne
+
+from models.job import JobRecord
+from services.skill_tokens import extract_skill_tokens, extract_skill_tokens_from_list, extract_known_skill_tokens
+
+class JobCatalog:
+    """Persistent store of every fetched posting (the `jobs` collection).
+    
+    Skill tokens are extracted once, when a job is written, into the multikey
+    indexed `skill_tokens` field: every title word, but only known skills from
+    the description (title tokens are also kept in `title_tokens`
+    so title hits can weigh more). Candidate retrieval then only touches jobs
+    that share at least one token with the resume.
+    """
+    
+    # Weight of a resume token found in a job, by where it came from
+    SKILL_WEIGHT = 2.0
+    EXPERTISE_WEIGHT = 1.0
+    TITLE_BONUS = 1.0  # Added on top when the token also appears in the title
+    
+    def __init__(self, db):
+        self.collection = db.jobs
+    
+    async def ensure_indexes(self):
+        await self.collection.create_index("fingerprint", unique=True)
+        await self.collection.create_index("skill_tokens")
+        await self.collection.create_index("first_seen_at")
+    
+    async def store_jobs(self, jobs: List[JobRecord]) -> int:
+        """Upsert jobs with their skill tokens. Returns the number of new postings."""
+        if not jobs:
+            return 0
+        
+        now = datetime.now(timezone.utc)
+        operations = []
+        for job in jobs:
+            doc = job.to_document()
+            doc["title_tokens"] = extract_skill_tokens(job.title)
+            doc["last_seen_at"] = now
+            on_insert = {"first_seen_at": now}
+            
+            # Never let a listing placeholder overwrite a description that was
+            # fetched from the detail page in an earlier run
+            description_fields = {
+                "description": doc.pop("description"),
+                "skill_tokens": self._skill_tokens(job)
+            }
+            if job.has_placeholder_description:
+                on_insert.update(description_fields)
+            else:
+                doc.update(description_fields)
+            
+            operations.append(UpdateOne(
+                {"fingerprint": doc["fingerprint"]},
+                {"$set": doc, "$setOnInsert": on_insert},
+                upsert=True
+            ))
+        
+        result = await self.collection.bulk_write(operations, ordered=False)
+        return result.upserted_count
+    
+    def _skill_tokens(self, job: JobRecord) -> List[str]:
+        # Titles are short and specific, so all their words count; descriptions
+        # only contribute known skills
+        return list(dict.fromkeys(extract_skill_tokens(job.title) + extract_known_skill_tokens(job.description)))
+    
+    async def get_enriched_descriptions(self, fingerprints: List[str]) -> Dict[str, str]:
+        """Full descriptions already fetched from detail pages, by fingerprint"""
+        docs = await self.collection.find(
+            {"fingerprint": {"$in": fingerprints}, "details_fetched_at": {"$exists": True}},
+            {"_id": 0, "fingerprint": 1, "description": 1}
+        ).to_list(len(fingerprints))
+        return {doc["fingerprint"]: doc["description"] for doc in docs}
+    
+    async def save_enriched_description(self, job: JobRecord):
+        """Persist a description fetched from the job's detail page.
+        
+        Enrichment runs before `store_jobs`, so this may be the first write for
+        a posting; it then inserts the full catalog document, including the
+        `first_seen_at` that delta matching and candidate ranking rely on.
+        """
+        now = datetime.now(timezone.utc)
+        posting = job.to_document()
+        posting.pop("description")
+        await self.collection.update_one(
+            {"fingerprint": job.fingerprint},
+            {
+                "$set": {
+                    "description": job.description,
+                    "skill_tokens": self._skill_tokens(job),
+                    "details_fetched_at": now
+                },
+                "$setOnInsert": {
+                    **{key: value for key, value in posting.items() if key != "fingerprint"},
+                    "title_tokens": extract_skill_tokens(job.title),
+                    "first_seen_at": now,
+                    "last_seen_at": now
+                }
+            },
+            upsert=True
+        )
+    
+    async def find_since(self, watermark, limit: int = 500) -> List[Dict]:
+        """Jobs first stored after `watermark` (oldest first), for incremental matching"""
+        query = {"first_seen_at": {"$gt": watermark}} if watermark else {}
+        return await self.collection.find(
+            query, {"_id": 0, "skill_tokens": 0, "title_tokens": 0}
+        ).sort("first_seen_at", 1).to_list(limit)
+    
+    async def get_jobs(self, fingerprints: List[str]) -> List[Dict]:
+        """Catalog documents for the given fingerprints, in the same order"""
+        docs = await self.collection.find(
+            {"fingerprint": {"$in": fingerprints}},
+            {"_id": 0, "skill_tokens": 0, "title_tokens": 0}
+        ).to_list(len(fingerprints))
+        by_fingerprint = {doc["fingerprint"]: doc for doc in docs}
+        return [by_fingerprint[fp] for fp in fingerprints if fp in by_fingerprint]
+    
+    async def find_candidates(self, resume_data: Dict, limit: int = 50) -> List[Dict]:
+        """Return catalog jobs ranked by weighted skill overlap with a resume.
+        
+        `resume_data` is a resume document (parsed_skills / expertise). Each
+        result is a job document with an added `skill_score`.
+        """
+        skill_tokens = extract_skill_tokens_from_list(resume_data.get("parsed_skills", []))
+        expertise_tokens = [
+            token for token in extract_skill_tokens_from_list(resume_data.get("expertise", []))
+            if token not in skill_tokens
+        ]
+        all_tokens = skill_tokens + expertise_tokens
+        if not all_tokens:
+            return []
+        
+        def overlap(field: str, tokens: List[str]) -> Dict:
+            return {"$size": {"$setIntersection": [{"$ifNull": [field, []]}, tokens]}}
+        
+        pipeline = [
+            {"$match": {"skill_tokens": {"$in": all_tokens}}},
+            {"$addFields": {"skill_score": {"$add": [
+                {"$multiply": [self.SKILL_WEIGHT, overlap("$skill_tokens", skill_tokens)]},
+                {"$multiply": [self.EXPERTISE_WEIGHT, overlap("$skill_tokens", expertise_tokens)]},
+                {"$multiply": [self.TITLE_BONUS, overlap("$title_tokens", all_tokens)]}
+            ]}}},
+            {"$sort": {"skill_score": -1, "first_seen_at": -1}},
+            {"$limit": limit},
+            {"$project": {"_id": 0, "skill_tokens": 0, "title_tokens": 0}}
+        ]
+        return await self.collection.aggregate(pipeline).to_list(limit)
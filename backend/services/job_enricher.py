@@ -0,0 +1,114 @@
+import asyncio
+from collections import Counter
+from typing import List, Dict, Set
+from urllib.parse import urlparse
+
+from models.job import JobRecord
+from services.skill_tokens import extract_skill_tokens, extract_skill_tokens_from_list
+
+class JobEnricher:
+    """Replaces placeholder descriptions with the text of the job's detail page.
+    
+    Only jobs whose title already shares a skill token with the resume are
+    enriched, at most `max_jobs_per_run` per workflow execution, and never
+    more than `max_per_host` concurrent requests to the same job board across
+    the whole process. Descriptions are cached in the job catalog (and pages
+    in the shared HTTP cache), so a posting is fetched once, not once per user.
+    """
+    
+    def __init__(self, job_fetchers, job_catalog=None, max_per_host: int = 2, max_jobs_per_run: int = 20, description_limit: int = 4000):
+        self.job_fetchers = job_fetchers
+        self.job_catalog = job_catalog
+        self.max_per_host = max_per_host
+        self.max_jobs_per_run = max_jobs_per_run
+        self.description_limit = description_limit
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+    
+    def for_resume(self, resume_data: Dict) -> "EnrichmentRun":
+        """Start an enrichment run for one workflow execution"""
+        resume_tokens = set(extract_skill_tokens_from_list(
+            resume_data.get("skills", []) + resume_data.get("expertise", [])
+        ))
+        return EnrichmentRun(self, resume_tokens)
+    
+    def _semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_semaphores[host]
+
+
+class EnrichmentRun:
+    """Per-execution enrichment state: the request budget and URLs already seen"""
+    
+    def __init__(self, enricher: JobEnricher, resume_tokens: Set[str]):
+        self.enricher = enricher
+        self.resume_tokens = resume_tokens
+        self.remaining = enricher.max_jobs_per_run
+        self.seen_urls: Set[str] = set()
+        self.stats = Counter()
+    
+    def _passes_prefilter(self, job: JobRecord) -> bool:
+        return bool(self.resume_tokens.intersection(extract_skill_tokens(job.title)))
+    
+    def _is_candidate(self, job: JobRecord, url_counts: Counter) -> bool:
+        if not job.has_placeholder_description or not job.url.startswith("http"):
+            return False
+        # Several cards sharing one URL means the scraper fell back to the search page
+        if url_counts[job.url] > 1 or job.url in self.seen_urls:
+            return False
+        fetcher = self.enricher.job_fetchers.get(job.source)
+        # Plugin fetchers that don't subclass BaseScraper have no detail page support
+        if not (fetcher and getattr(fetcher, "has_detail_pages", False)):
+            return False
+        # A lone card can fall back to the search page too; its "details" would be the search results
+        return not fetcher.is_listing_url(job.url)
+    
+    async def enrich(self, jobs: List[JobRecord]):
+        """Fill in full descriptions for the shortlisted jobs of a batch, in place"""
+        url_counts = Counter(job.url for job in jobs)
+        candidates = [job for job in jobs if self._is_candidate(job, url_counts) and self._passes_prefilter(job)]
+        if not candidates:
+            return
+        
+        # Descriptions fetched in earlier runs cost no request
+        if self.enricher.job_catalog:
+            cached = await self.enricher.job_catalog.get_enriched_descriptions([job.fingerprint for job in candidates])
+            for job in candidates:
+                if job.fingerprint in cached:
+                    job.description = cached[job.fingerprint]
+                    self.stats["cached"] += 1
+            candidates = [job for job in candidates if job.fingerprint not in cached]
+        
+        candidates = candidates[:max(self.remaining, 0)]
+        if not candidates:
+            return
+        self.remaining -= len(candidates)
+        self.seen_urls.update(job.url for job in candidates)
+        
+        import aiohttp  # Keep the HTTP client off the server's import path
+        async with aiohttp.ClientSession() as session:
+            await asyncio.gather(*[self._enrich_job(session, job) for job in candidates])
+    
+    async def _enrich_job(self, session, job: JobRecord):
+        fetcher = self.enricher.job_fetchers[job.source]
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        }
+        
+        try:
+            async with self.enricher._semaphore(job.url):
+                html = await fetcher.get_page(session, job.url, headers)
+            description = await fetcher.parse_detail(html) if html else None
+        except Exception as e:
+            print(f"Error fetching job details for {job.url}: {str(e)}")
+            description = None
+        
+        if not description:
+            self.stats["failed"] += 1
+            return
+        
+        job.description = description[:self.enricher.description_limit]
+        self.stats["fetched"] += 1
+        if self.enricher.job_catalog:
+            await self.enricher.job_catalog.save_enriched_description(job)
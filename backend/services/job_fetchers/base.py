@@ -0,0 +1,103 @@
+from typing import List, Dict, Optional, AsyncIterator
+
+from models.job import JobRecord
+from services.http_cache import get_page_cache
+from services.cpu_pool import run_cpu_bound
+from services.profiler import span
+from services.single_flight import SingleFlight
+
+# Listing downloads in flight across all scraper instances
+_listing_flights = SingleFlight()
+
+# Search/listing pages fetched recently. Scrapers fall back to the listing URL
+# for cards without a link, so a job with one of these URLs has no detail page.
+_listing_urls: Dict[str, None] = {}
+MAX_LISTING_URLS = 10000
+
+
+def extract_description(html: str, selectors: List[str]) -> Optional[str]:
+    """Find the job description block on a detail page"""
+    from bs4 import BeautifulSoup  # Only needed for enrichment
+    
+    soup = BeautifulSoup(html, 'html.parser')
+    for selector in selectors:
+        elem = soup.select_one(selector)
+        if elem:
+            text = elem.get_text(" ", strip=True)
+            if text:
+                return text
+    
+    # Fall back to the page summary most job boards publish for link previews
+    for attrs in ({'name': 'description'}, {'property': 'og:description'}):
+        meta = soup.find('meta', attrs=attrs)
+        if meta and meta.get('content'):
+            return meta['content'].strip()
+    return None
+
+
+class BaseScraper:
+    """Common interface for job board scrapers.
+    
+    Subclasses implement `stream_jobs` as an async generator that yields each
+    job as soon as it is parsed, so the workflow can start scoring before the
+    slowest source has finished. `fetch_jobs` collects the stream for callers
+    that still want the whole list at once.
+    
+    Downloads happen on the event loop; HTML parsing is CPU-bound and runs
+    in the shared process pool. `fetch_listing` does both, and concurrent
+    workflows asking for the same listing share one download and parse.
+    
+    `detail_selectors` lists CSS selectors for the description block on a
+    job's detail page; JobEnricher uses them to replace listing placeholders.
+    """
+    
+    has_detail_pages = True
+    detail_selectors: List[str] = []
+    
+    async def fetch_listing(self, url: str, headers: Dict, parse_fn, *args) -> List[JobRecord]:
+        """Download a listing page and parse it with `parse_fn(html, *args)`.
+        
+        `parse_fn` must be a module-level function returning plain field dicts
+        (it runs in the CPU pool). Identical requests already in flight are
+        joined rather than repeated; every caller still gets its own records,
+        since the matcher scores them in place.
+        """
+        _listing_urls.pop(url, None)
+        _listing_urls[url] = None
+        if len(_listing_urls) > MAX_LISTING_URLS:
+            del _listing_urls[next(iter(_listing_urls))]
+        
+        key = (url, tuple(sorted(headers.items())), parse_fn.__module__, parse_fn.__qualname__, args)
+        rows = await _listing_flights.do(key, lambda: self._download_and_parse(url, headers, parse_fn, *args))
+        return [JobRecord(**fields) for fields in rows]
+    
+    async def _download_and_parse(self, url: str, headers: Dict, parse_fn, *args) -> List[Dict]:
+        import aiohttp  # Keep the HTTP client off the server's import path
+        
+        # The shared task owns its session, so a cancelled caller can't close it under the others
+        async with aiohttp.ClientSession() as session:
+            html = await self.get_page(session, url, headers)
+        if not html:
+            return []
+        return await run_cpu_bound(parse_fn, html, *args)
+    
+    async def stream_jobs(self, keywords: str = "software engineer", limit: int = 20, **kwargs) -> AsyncIterator[JobRecord]:
+        raise NotImplementedError
+        yield
+    
+    async def fetch_jobs(self, keywords: str = "software engineer", limit: int = 20, **kwargs) -> List[JobRecord]:
+        """Fetch all jobs from this source"""
+        return [job async for job in self.stream_jobs(keywords=keywords, limit=limit, **kwargs)]
+    
+    async def get_page(self, session, url: str, headers: Dict) -> Optional[str]:
+        """Download a page through the shared HTTP cache (None unless the response is OK)"""
+        with span("fetch", url):
+            return await get_page_cache().get_text(session, url, headers=headers, timeout=10)
+    
+    def is_listing_url(self, url: str) -> bool:
+        """True if `url` is a search page this process scraped (a card's fallback link)"""
+        return url in _listing_urls
+    
+    async def parse_detail(self, html: str) -> Optional[str]:
+        """Extract the full job description from a detail page (in the CPU pool)"""
+        return await run_cpu_bound(extract_description, html, list(self.detail_selectors))
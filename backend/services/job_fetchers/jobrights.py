@@ -1,15 +1,18 @@
 import aiohttp
-from typing import List, Dict
+from typing import AsyncIterator
 from datetime import datetime, timedelta, timezone
 
-class JobrightsScraper:
+from models.job import JobRecord
+from services.job_fetchers.base import BaseScraper
+
+class JobrightsScraper(BaseScraper):
+    has_detail_pages = False  # Mock data, the URLs don't resolve
+    
     def __init__(self):
         self.base_url = "https://jobrights.ai"
     
-    async def fetch_jobs(self, keywords: str = "software engineer", limit: int = 20) -> List[Dict]:
+    async def stream_jobs(self, keywords: str = "software engineer", limit: int = 20) -> AsyncIterator[JobRecord]:
         """Scrape Jobrights.ai jobs"""
-        jobs = []
-        
         try:
             # Jobrights.ai might have an API or require different scraping approach
             # This is a placeholder implementation
@@ -19,20 +22,16 @@ class JobrightsScraper:
                 }
                 
                 # Mock data for now - replace with actual scraping logic
-                jobs = [
-                    {
-                        'job_id': f"jobrights_{i+1}",
-                        'source': 'jobrights',
-                        'title': f'AI/ML Engineer - {keywords}',
-                        'company': 'Tech Startup',
-                        'description': 'Exciting opportunity in AI and machine learning',
-                        'location': 'Remote',
-                        'url': f'{self.base_url}/jobs/{i+1}',
-                        'posted_date': datetime.now(timezone.utc) - timedelta(hours=5)
-                    }
-                    for i in range(min(3, limit))  # Return limited mock data
-                ]
+                for i in range(min(3, limit)):  # Return limited mock data
+                    yield JobRecord(
+                        job_id=f"jobrights_{i+1}",
+                        source='jobrights',
+                        title=f'AI/ML Engineer - {keywords}',
+                        company='Tech Startup',
+                        description='Exciting opportunity in AI and machine learning',
+                        location='Remote',
+                        url=f'{self.base_url}/jobs/{i+1}',
+                        posted_date=datetime.now(timezone.utc) - timedelta(hours=5)
+                    )
         except Exception as e:
             print(f"Jobrights scraping error: {e}")
-        
-        return jobs
\ No newline at end of file
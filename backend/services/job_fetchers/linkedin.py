@@ -1,58 +1,61 @@
-import aiohttp
 from bs4 import BeautifulSoup
-from typing import List, Dict
+from typing import List, Dict, AsyncIterator
 from datetime import datetime, timedelta, timezone
-import asyncio
 
-class LinkedInScraper:
+from models.job import JobRecord
+from services.job_fetchers.base import BaseScraper
+
+def parse_listing(html: str, limit: int, search_url: str) -> List[Dict]:
+    """Parse LinkedIn job cards (runs in the CPU pool)"""
+    jobs = []
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Parse job cards (simplified - actual structure may vary)
+    job_cards = soup.find_all('div', class_='base-card', limit=limit)
+    
+    for card in job_cards:
+        try:
+            title_elem = card.find('h3', class_='base-search-card__title')
+            company_elem = card.find('h4', class_='base-search-card__subtitle')
+            location_elem = card.find('span', class_='job-search-card__location')
+            link_elem = card.find('a', class_='base-card__full-link')
+            
+            if title_elem and company_elem:
+                jobs.append({
+                    'job_id': f"linkedin_{len(jobs)+1}",
+                    'source': 'linkedin',
+                    'title': title_elem.text.strip(),
+                    'company': company_elem.text.strip(),
+                    'description': 'View job details on LinkedIn',
+                    'location': location_elem.text.strip() if location_elem else 'Remote',
+                    'url': link_elem['href'] if link_elem else search_url,
+                    'posted_date': datetime.now(timezone.utc) - timedelta(hours=12)
+                })
+        except Exception:
+            continue
+    
+    return jobs
+
+class LinkedInScraper(BaseScraper):
+    detail_selectors = ['div.show-more-less-html__markup', 'div.description__text']
+    
     def __init__(self):
         self.base_url = "https://www.linkedin.com"
     
-    async def fetch_jobs(self, keywords: str = "software engineer", limit: int = 20) -> List[Dict]:
+    async def stream_jobs(self, keywords: str = "software engineer", limit: int = 20) -> AsyncIterator[JobRecord]:
         """Scrape LinkedIn jobs (last 24 hours)"""
-        jobs = []
-        
         # Note: LinkedIn heavily rate-limits scraping. This is a simplified version.
         # In production, you'd use LinkedIn API or a dedicated scraping service.
         
         try:
-            async with aiohttp.ClientSession() as session:
-                # Using LinkedIn job search URL
-                search_url = f"https://www.linkedin.com/jobs/search/?keywords={keywords.replace(' ', '%20')}&f_TPR=r86400"  # r86400 = last 24 hours
-                
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-                
-                async with session.get(search_url, headers=headers, timeout=10) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        # Parse job cards (simplified - actual structure may vary)
-                        job_cards = soup.find_all('div', class_='base-card', limit=limit)
-                        
-                        for card in job_cards:
-                            try:
-                                title_elem = card.find('h3', class_='base-search-card__title')
-                                company_elem = card.find('h4', class_='base-search-card__subtitle')
-                                location_elem = card.find('span', class_='job-search-card__location')
-                                link_elem = card.find('a', class_='base-card__full-link')
-                                
-                                if title_elem and company_elem:
-                                    jobs.append({
-                                        'job_id': f"linkedin_{len(jobs)+1}",
-                                        'source': 'linkedin',
-                                        'title': title_elem.text.strip(),
-                                        'company': company_elem.text.strip(),
-                                        'description': 'View job details on LinkedIn',
-                                        'location': location_elem.text.strip() if location_elem else 'Remote',
-                                        'url': link_elem['href'] if link_elem else search_url,
-                                        'posted_date': datetime.now(timezone.utc) - timedelta(hours=12)
-                                    })
-                            except Exception:
-                                continue
+            # Using LinkedIn job search URL
+            search_url = f"https://www.linkedin.com/jobs/search/?keywords={keywords.replace(' ', '%20')}&f_TPR=r86400"  # r86400 = last 24 hours
+            
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            }
+            
+            for job in await self.fetch_listing(search_url, headers, parse_listing, limit, search_url):
+                yield job
         except Exception as e:
             print(f"LinkedIn scraping error: {e}")
-        
-        return jobs
\ No newline at end of file
@@ -0,0 +1,82 @@
+from collections.abc import Mapping
+from importlib import import_module
+from importlib.metadata import entry_points, EntryPoint
+from typing import Dict, Iterator, Union, Callable
+
+from services.job_fetchers.base import BaseScraper
+
+# Third-party packages can add sources by declaring an entry point in this
+# group, e.g. `remoteok = "my_pkg.remoteok:RemoteOkScraper"`.
+ENTRY_POINT_GROUP = "job_matcher.fetchers"
+
+BUILTIN_FETCHERS = {
+    "linkedin": "services.job_fetchers.linkedin:LinkedInScraper",
+    "indeed": "services.job_fetchers.indeed:IndeedScraper",
+    "jobrights": "services.job_fetchers.jobrights:JobrightsScraper",
+    "startups_gallery": "services.job_fetchers.startups_gallery:StartupsGalleryScraper",
+    "briansjobs": "services.job_fetchers.briansjobs:BriansJobsScraper",
+    "glassdoor": "services.job_fetchers.glassdoor:GlassdoorScraper",
+    "ycombinator": "services.job_fetchers.ycombinator:YCombinatorScraper",
+    "wellfound": "services.job_fetchers.wellfound:WellfoundScraper"
+}
+
+FetcherSpec = Union[str, EntryPoint, Callable[[], BaseScraper]]
+
+class FetcherRegistry(Mapping):
+    """Source name -> scraper, imported and instantiated on first use.
+    
+    Behaves like the old `job_fetchers` dict, but a scraper module (and its
+    aiohttp/BeautifulSoup imports) is only loaded the first time its source is
+    requested. Entry points are discovered lazily as well.
+    """
+    
+    def __init__(self, specs: Dict[str, FetcherSpec] = None, load_entry_points: bool = True):
+        self._specs: Dict[str, FetcherSpec] = dict(BUILTIN_FETCHERS if specs is None else specs)
+        self._instances: Dict[str, BaseScraper] = {}
+        self._load_entry_points = load_entry_points
+    
+    def register(self, source: str, spec: FetcherSpec):
+        """Register a scraper as "module:Class" or as a zero-argument factory"""
+        self._specs[source] = spec
+        self._instances.pop(source, None)
+    
+    def _discover(self):
+        if not self._load_entry_points:
+            return
+        self._load_entry_points = False
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            self._specs.setdefault(entry_point.name, entry_point)
+    
+    def _create(self, spec: FetcherSpec) -> BaseScraper:
+        if isinstance(spec, str):
+            module_name, _, attr = spec.partition(":")
+            factory = getattr(import_module(module_name), attr)
+        elif isinstance(spec, EntryPoint):
+            factory = spec.load()
+        else:
+            factory = spec
+        return factory()
+    
+    def __getitem__(self, source: str) -> BaseScraper:
+        if source not in self._instances:
+            self._discover()
+            if source not in self._specs:
+                raise KeyError(source)
+            self._instances[source] = self._create(self._specs[source])
+        return self._instances[source]
+    
+    def __contains__(self, source) -> bool:
+        self._discover()
+        return source in self._specs
+    
+    def __iter__(self) -> Iterator[str]:
+        self._discover()
+        return iter(self._specs)
+    
+    def __len__(self) -> int:
+        self._discover()
+        return len(self._specs)
+    
+    def loaded(self) -> Dict[str, BaseScraper]:
+        """Scrapers that have been instantiated so far"""
+        return dict(self._instances)
@@ -0,0 +1,119 @@
+import re
+import time
+from collections import Counter
+from datetime import timezone
+from typing import Dict, List
+
+from models.job import JobRecord
+
+# Locations that fit anyone open to remote work
+REMOTE_TERMS = ["remote", "anywhere", "flexible", "various"]
+
+# Title keywords per seniority level; earlier levels win ("Senior Engineering Manager" is a manager)
+SENIORITY_KEYWORDS = {
+    "manager": ["manager", "director", "head of", "vp", "vice president"],
+    "lead": ["lead", "staff", "principal", "architect", "distinguished"],
+    "senior": ["senior", "sr"],
+    "junior": ["junior", "jr", "entry level", "graduate", "new grad"],
+    "intern": ["intern", "internship", "co op", "coop", "trainee"],
+}
+
+def _normalize(text: str) -> str:
+    """Lowercase, punctuation to spaces, padded so ' kw ' matches whole words"""
+    return f" {re.sub(r'[^a-z0-9+#]+', ' ', (text or '').lower()).strip()} "
+
+def _contains_any(haystack, keywords: List[str]):
+    """Boolean array: which strings in the numpy array `haystack` contain any keyword"""
+    import numpy as np
+    
+    found = np.zeros(len(haystack), dtype=bool)
+    for keyword in keywords:
+        found |= np.char.find(haystack, _normalize(keyword)) >= 0
+    return found
+
+class JobFilter:
+    """Rule-based pre-filter that drops out-of-scope jobs before any scoring.
+    
+    Rules come from the request's preferences (see JobPreferences): allowed
+    locations (remote postings pass when `remote_ok`), a maximum posting age,
+    required and excluded title keywords, and allowed seniority levels
+    inferred from the title. Jobs are checked a chunk at a time, before
+    they are batched for scoring, with numpy string and date operations
+    (numpy is only imported once a filter with rules runs); jobs with an
+    unknown location, date or level are kept.
+    """
+    
+    def __init__(self, preferences: Dict = None):
+        preferences = preferences or {}
+        self.locations = [_normalize(term) for term in preferences.get("locations") or []]
+        self.remote_ok = preferences.get("remote_ok", True)
+        self.max_age_days = preferences.get("max_age_days")
+        self.include_title_keywords = preferences.get("include_title_keywords") or []
+        self.exclude_title_keywords = preferences.get("exclude_title_keywords") or []
+        self.seniority = [level.lower() for level in preferences.get("seniority") or []]
+        self.checked = 0
+        self.dropped = Counter()
+    
+    @property
+    def active(self) -> bool:
+        return bool(self.locations or self.max_age_days or self.include_title_keywords
+                    or self.exclude_title_keywords or self.seniority)
+    
+    def apply(self, jobs: List[JobRecord]) -> List[JobRecord]:
+        """Return the jobs that pass every rule, counting drops by the first rule failed"""
+        self.checked += len(jobs)
+        if not jobs or not self.active:
+            return jobs
+        
+        import numpy as np
+        
+        keep = np.ones(len(jobs), dtype=bool)
+        titles = np.array([_normalize(job.title) for job in jobs])
+        
+        if self.locations:
+            locations = np.array([_normalize(job.location) for job in jobs])
+            allowed = _contains_any(locations, self.locations) | (locations == _normalize(""))  # Unknown location
+            if self.remote_ok:
+                allowed |= _contains_any(locations, REMOTE_TERMS)
+            self._drop(keep, ~allowed, "location")
+        
+        if self.max_age_days:
+            posted = np.array([self._timestamp(job) for job in jobs], dtype=np.float64)
+            with np.errstate(invalid="ignore"):  # NaN (no date) compares False and is kept
+                stale = time.time() - posted > self.max_age_days * 86400
+            self._drop(keep, stale, "stale")
+        
+        if self.exclude_title_keywords:
+            self._drop(keep, _contains_any(titles, self.exclude_title_keywords), "title")
+        if self.include_title_keywords:
+            self._drop(keep, ~_contains_any(titles, self.include_title_keywords), "title")
+        
+        if self.seniority:
+            levels = np.full(len(jobs), "", dtype=object)
+            for level, keywords in reversed(SENIORITY_KEYWORDS.items()):
+                levels[_contains_any(titles, keywords)] = level
+            mismatch = (levels != "") & ~np.isin(levels, self.seniority)
+            self._drop(keep, mismatch, "seniority")
+        
+        return [job for job, kept in zip(jobs, keep) if kept]
+    
+    def _drop(self, keep, mask, reason: str):
+        newly_dropped = keep & mask
+        if newly_dropped.any():
+            self.dropped[reason] += int(newly_dropped.sum())
+            keep &= ~mask
+    
+    def _timestamp(self, job: JobRecord) -> float:
+        if not job.posted_date:
+            return float("nan")
+        posted = job.posted_date
+        if posted.tzinfo is None:  # Mongo returns naive UTC datetimes
+            posted = posted.replace(tzinfo=timezone.utc)
+        return posted.timestamp()
+    
+    def report(self) -> Dict:
+        return {
+            "checked": self.checked,
+            "kept": self.checked - sum(self.dropped.values()),
+            "dropped": dict(self.dropped)
+        }
@@ -1,15 +1,16 @@
-from typing import List, Dict
-import os
-import google.generativeai as genai
-import json
+import asyncio
+import dataclasses
+from typing import List, Dict, Set, AsyncIterator, Callable, Awaitable, Optional
+
+from models.job import JobRecord
+from services import llm
+from services.llm_budget import LLMBudget
+from services.job_filter import JobFilter
+from services.skill_tokens import extract_skill_tokens, extract_skill_tokens_from_list, extract_known_skill_tokens
 
 class JobMatcher:
-    def __init__(self):
-        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
-    
-    async def match_jobs(self, resume_data: Dict, jobs: List[Dict]) -> List[Dict]:
-        """Match jobs against resume using Gemini"""
+    async def match_jobs(self, resume_data: Dict, jobs: List[JobRecord], budget: Optional[LLMBudget] = None) -> List[JobRecord]:
+        """Match jobs against resume using Gemini (locally once `budget` is spent)"""
         if not jobs:
             return []
         
@@ -19,22 +20,98 @@ class JobMatcher:
         batch_size = 5
         for i in range(0, len(jobs), batch_size):
             batch = jobs[i:i+batch_size]
-            matches = await self._match_batch(resume_data, batch)
+            matches = await self._match_batch(resume_data, batch, budget)
             matched_jobs.extend(matches)
         
-        # Sort by match score and return top matches
-        matched_jobs.sort(key=lambda x: x.get('match_score', 0), reverse=True)
-        return [job for job in matched_jobs if job.get('match_score', 0) >= 60]  # Only return 60%+ matches
+        return self.select_matches(matched_jobs)
     
-    async def _match_batch(self, resume_data: Dict, jobs: List[Dict]) -> List[Dict]:
-        """Match a batch of jobs"""
-        try:
-            jobs_text = "\n\n".join([
-                f"Job {idx+1}:\nTitle: {job['title']}\nCompany: {job['company']}\nDescription: {job['description'][:500]}..."
-                for idx, job in enumerate(jobs)
-            ])
-            
-            prompt = f"""You are an expert job matcher. Analyze these jobs against the candidate's profile and provide match scores.
+    async def match_stream(self, resume_data: Dict, jobs: AsyncIterator[JobRecord], batch_size: int = 5,
+                           prepare_batch: Optional[Callable[[List[JobRecord]], Awaitable]] = None,
+                           budget: Optional[LLMBudget] = None, job_filter: Optional[JobFilter] = None) -> List[JobRecord]:
+        """Score jobs from an async stream, starting each batch as soon as it fills.
+        
+        `job_filter` drops out-of-scope jobs before batching: incoming jobs are
+        filtered `batch_size` at a time and only survivors fill the scoring
+        batches, so filtering saves whole Gemini calls. Without active rules
+        jobs go straight into batches.
+        `prepare_batch` runs on each batch right before it is scored (e.g. to
+        enrich descriptions), and `budget` caps the Gemini calls for the run.
+        Returns every scored job (unfiltered); use `select_matches` to pick
+        the ones worth surfacing.
+        """
+        scored_jobs = []
+        unfiltered = []
+        batch = []
+        
+        async def score_full_batches(final: bool = False):
+            nonlocal batch
+            while len(batch) >= batch_size or (final and batch):
+                scored_jobs.extend(await self._score_batch(resume_data, batch[:batch_size], prepare_batch, budget))
+                batch = batch[batch_size:]
+        
+        async for job in jobs:
+            if job_filter is not None and job_filter.active:
+                unfiltered.append(job)
+                if len(unfiltered) >= batch_size:
+                    batch.extend(job_filter.apply(unfiltered))
+                    unfiltered = []
+            else:
+                # Nothing to filter out (apply only counts the job), so don't hold it back
+                batch.extend(job_filter.apply([job]) if job_filter is not None else [job])
+            await score_full_batches()
+        
+        if unfiltered:
+            batch.extend(job_filter.apply(unfiltered))
+        await score_full_batches(final=True)
+        
+        return scored_jobs
+    
+    async def _score_batch(self, resume_data: Dict, batch: List[JobRecord], prepare_batch,
+                           budget: Optional[LLMBudget]) -> List[JobRecord]:
+        if prepare_batch:
+            try:
+                await prepare_batch(batch)
+            except Exception as e:
+                # Preparation is best-effort; score the batch as it is
+                print(f"Error preparing job batch: {str(e)}")
+        return await self._match_batch(resume_data, batch, budget)
+    
+    def select_matches(self, scored_jobs: List[JobRecord]) -> List[JobRecord]:
+        """Sort scored jobs and keep only the strong matches"""
+        matched_jobs = sorted(scored_jobs, key=lambda x: x.match_score or 0, reverse=True)
+        return [job for job in matched_jobs if (job.match_score or 0) >= 60]  # Only return 60%+ matches
+    
+    def score_locally(self, resume_data: Dict, jobs: List[JobRecord], resume_tokens: Optional[Set[str]] = None) -> List[JobRecord]:
+        """Deterministic keyword-overlap score for jobs the LLM did not score.
+        
+        70 points scale with the share of the job's skill tokens the candidate
+        has, 30 more if the title itself names one of their skills.
+        """
+        if resume_tokens is None:
+            resume_tokens = set(extract_skill_tokens_from_list(
+                resume_data.get('skills', []) + resume_data.get('expertise', [])
+            ))
+        
+        for job in jobs:
+            title_tokens = set(extract_skill_tokens(job.title))
+            job_tokens = title_tokens.union(extract_known_skill_tokens(job.description))
+            overlap = sorted(resume_tokens & job_tokens)
+            coverage = len(overlap) / len(job_tokens) if job_tokens else 0
+            job.match_score = round(70 * coverage + (30 if resume_tokens & title_tokens else 0))
+            if overlap:
+                job.match_reason = f"Keyword match on {', '.join(overlap[:5])} ({len(overlap)} of {len(job_tokens)} job skills)"
+            else:
+                job.match_reason = 'No overlapping skills found'
+            job.scorer = 'local'
+        return jobs
+    
+    def _build_prompt(self, resume_data: Dict, jobs: List[JobRecord]) -> str:
+        jobs_text = "\n\n".join([
+            f"Job {idx+1}:\nTitle: {job.title}\nCompany: {job.company}\nDescription: {job.description[:500]}..."
+            for idx, job in enumerate(jobs)
+        ])
+        
+        return f"""You are an expert job matcher. Analyze these jobs against the candidate's profile and provide match scores.
 
 Candidate Profile:
 - Skills: {', '.join(resume_data.get('skills', []))}
@@ -50,30 +127,87 @@ For each job, provide:
 
 Return ONLY valid JSON array: [{{"job_index": 0, "match_score": 85, "match_reason": "..."}}]
 """
+    
+    def _build_candidates_prompt(self, job: JobRecord, profiles: List[Dict]) -> str:
+        candidates_text = "\n".join([
+            f"Candidate {idx}: Skills: {', '.join(profile.get('skills', [])[:15])} | "
+            f"Experience: {profile.get('experience', 'Not specified')} | "
+            f"Expertise: {', '.join(profile.get('expertise', [])[:5])}"
+            for idx, profile in enumerate(profiles)
+        ])
+        
+        return f"""You are an expert job matcher. Analyze how well each candidate fits this job and provide match scores.
+
+Job:
+- Title: {job.title}
+- Company: {job.company}
+- Location: {job.location or 'Not specified'}
+- Description: {job.description[:2000]}
+
+Candidates to evaluate:
+{candidates_text}
+
+For each candidate, provide:
+1. Match score (0-100) based on skills, experience, and fit
+2. Brief reason for the match score (1-2 sentences)
+
+Return ONLY valid JSON array: [{{"candidate_index": 0, "match_score": 85, "match_reason": "..."}}]
+"""
+    
+    async def match_candidates(self, job: JobRecord, profiles: List[Dict], budget: Optional[LLMBudget] = None,
+                               batch_size: int = 8) -> List[JobRecord]:
+        """Score one job against many candidate profiles (job-centric mode for digest runs).
+        
+        Each prompt carries the job description once and a compact batch of
+        profiles, so a popular posting isn't re-sent once per user. Returns a
+        scored copy of `job` per profile, in the same order.
+        """
+        copies = [dataclasses.replace(job, match_score=None, match_reason=None, scorer=None) for _ in profiles]
+        for i in range(0, len(profiles), batch_size):
+            batch = profiles[i:i+batch_size]
+            targets = copies[i:i+batch_size]
+            await self._score_with_llm(self._build_candidates_prompt(job, batch), targets, 'candidate_index', budget)
+            for profile, target in zip(batch, targets):
+                if target.match_score is None:
+                    self.score_locally(profile, [target])
+        return copies
+    
+    async def _match_batch(self, resume_data: Dict, jobs: List[JobRecord], budget: Optional[LLMBudget] = None) -> List[JobRecord]:
+        """Match a batch of jobs"""
+        await self._score_with_llm(self._build_prompt(resume_data, jobs), jobs, 'job_index', budget)
+        
+        # Jobs the model skipped (or all of them on error or over budget) get a local score
+        unscored = [job for job in jobs if job.match_score is None]
+        if unscored:
+            self.score_locally(resume_data, unscored)
+        return jobs
+    
+    async def _score_with_llm(self, prompt: str, targets: List[JobRecord], index_key: str, budget: Optional[LLMBudget]):
+        """Send a scoring prompt and record the results on `targets` in place.
+        
+        Results are addressed by `index_key` into `targets`; anything left
+        unscored (budget spent, call failed, entry missing) keeps match_score None.
+        """
+        if budget and not budget.allows(prompt):
+            return
+        
+        result_text = ""
+        try:
+            # Don't let a slow call overrun the run's time budget
+            timeout = budget.remaining_seconds() if budget else None
+            result_text = await asyncio.wait_for(llm.generate(prompt), timeout)
+            matches = llm.parse_json_response(result_text)
             
-            response = self.model.generate_content(prompt)
-            result_text = response.text.strip()
-            
-            # Extract JSON from response
-            if result_text.startswith('```json'):
-                result_text = result_text.split('```json')[1].split('```')[0].strip()
-            elif result_text.startswith('```'):
-                result_text = result_text.split('```')[1].split('```')[0].strip()
-            
-            matches = json.loads(result_text)
-            
-            # Merge match results with original job data
-            result = []
+            # Record match results on the job records in place
             for match in matches:
-                job_idx = match['job_index']
-                if 0 <= job_idx < len(jobs):
-                    job_copy = jobs[job_idx].copy()
-                    job_copy['match_score'] = match['match_score']
-                    job_copy['match_reason'] = match['match_reason']
-                    result.append(job_copy)
-            
-            return result
+                idx = match[index_key]
+                if 0 <= idx < len(targets):
+                    target = targets[idx]
+                    target.match_score = match['match_score']
+                    target.match_reason = match['match_reason']
+                    target.scorer = 'llm'
         except Exception as e:
-            print(f"Error matching jobs with Gemini: {str(e)}")
-            # Return jobs with default scores on error
-            return [{'match_score': 50, 'match_reason': 'Unable to calculate precise match', **job} for job in jobs]
\ No newline at end of file
+            print(f"Error matching jobs with Gemini: {str(e) or type(e).__name__}")
+        finally:
+            if budget:
+                budget.charge(prompt, result_text)
@@ -0,0 +1,101 @@
+import asyncio
+import os
+import socket
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from pymongo.errors import DuplicateKeyError
+
+def replica_id() -> str:
+    """Identity of this server process, unique across replicas and restarts"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+class Lease:
+    """A held lease; `lost` turns True if a heartbeat finds it taken over"""
+    
+    def __init__(self, name: str, owner: str, token: str):
+        self.name = name
+        self.owner = owner
+        self.token = token
+        self.lost = False
+
+class LeaseManager:
+    """Named leases in the `leases` collection, shared by every replica.
+    
+    A lease document (`_id` = lease name) records its owner, a token unique
+    to each acquisition and an `expires_at` deadline. Acquiring succeeds only
+    when no document exists or the current one has expired, even for the
+    replica that holds it, so two tasks on one node can't both run the work;
+    otherwise the upsert collides on `_id` and the caller backs off. Renewals
+    and releases match the token, so a holder can't extend or delete a lease
+    that has since been re-acquired. Holders renew the deadline with
+    heartbeats, so a replica that dies only blocks the work for one TTL. A TTL
+    index removes expired documents in the background.
+    """
+    
+    def __init__(self, db, owner: Optional[str] = None, ttl_seconds: float = 60):
+        self.collection = db.leases
+        self.owner = owner or replica_id()
+        self.ttl_seconds = ttl_seconds
+    
+    async def ensure_indexes(self):
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+    
+    def _deadline(self, ttl_seconds: Optional[float] = None) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds or self.ttl_seconds)
+    
+    async def acquire(self, name: str, ttl_seconds: Optional[float] = None) -> Optional[str]:
+        """Take `name`, returning this acquisition's token; None if it is held (by anyone)"""
+        now = datetime.now(timezone.utc)
+        token = uuid.uuid4().hex
+        try:
+            await self.collection.update_one(
+                {"_id": name, "expires_at": {"$lt": now}},
+                {"$set": {"owner": self.owner, "token": token, "expires_at": self._deadline(ttl_seconds), "acquired_at": now}},
+                upsert=True
+            )
+            return token
+        except DuplicateKeyError:
+            return None
+    
+    async def renew(self, name: str, token: str, ttl_seconds: Optional[float] = None) -> bool:
+        """Push the deadline back; False if the lease expired and was taken by someone else"""
+        result = await self.collection.update_one(
+            {"_id": name, "token": token},
+            {"$set": {"expires_at": self._deadline(ttl_seconds)}}
+        )
+        return result.matched_count == 1
+    
+    async def release(self, name: str, token: str):
+        await self.collection.delete_one({"_id": name, "token": token})
+    
+    @asynccontextmanager
+    async def hold(self, name: str):
+        """Yield a Lease while holding `name` (heartbeating), or None if it is taken"""
+        token = await self.acquire(name)
+        if token is None:
+            yield None
+            return
+        
+        lease = Lease(name, self.owner, token)
+        heartbeat = asyncio.create_task(self._heartbeat(lease))
+        try:
+            yield lease
+        finally:
+            heartbeat.cancel()
+            if not lease.lost:
+                await self.release(name, lease.token)
+    
+    async def _heartbeat(self, lease: Lease):
+        while True:
+            await asyncio.sleep(self.ttl_seconds / 3)
+            try:
+                if not await self.renew(lease.name, lease.token):
+                    lease.lost = True
+                    print(f"Lease {lease.name} was taken over by another replica")
+                    return
+            except Exception as e:
+                # Keep trying; the lease only lapses after a full TTL without renewals
+                print(f"Error renewing lease {lease.name}: {str(e)}")
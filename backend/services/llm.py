@@ -0,0 +1,55 @@
+import os
+import json
+import hashlib
+from typing import Any
+
+from services.single_flight import SingleFlight
+from services.llm_scheduler import get_scheduler
+from services.profiler import span
+
+# The Gemini SDK is slow to import, so it is loaded (and configured) the first
+# time a prompt is sent rather than when the server module is imported.
+_model = None
+
+# Identical prompts in flight at once (e.g. the same resume submitted twice,
+# or similar profiles scoring the same batch) share one request
+_flights = SingleFlight()
+
+def get_model():
+    """Return the process-wide Gemini model, creating it on first use"""
+    global _model
+    if _model is None:
+        import google.generativeai as genai
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+        _model = genai.GenerativeModel(os.getenv("GEMINI_MODEL", 'gemini-2.0-flash-exp'))
+    return _model
+
+def set_model(model):
+    """Replace the shared model (used by tests and the load-testing harness)"""
+    global _model
+    _model = model
+
+async def generate(prompt: str) -> str:
+    """Send a prompt to the shared model and return the stripped response text"""
+    key = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+    return await _flights.do(key, lambda: _generate(prompt))
+
+async def _generate(prompt: str) -> str:
+    async def call():
+        with span("llm", f"generate_content ({len(prompt)} chars)"):
+            return await get_model().generate_content_async(prompt)
+    
+    # Admission (rate limits, fair share, 429 backoff) is handled by the scheduler;
+    # the outer span includes time spent queued there
+    with span("llm_request", "scheduler"):
+        response = await get_scheduler().run(prompt, call)
+    return response.text.strip()
+
+def parse_json_response(result_text: str) -> Any:
+    """Parse JSON from a model response, unwrapping ``` fences if present"""
+    if result_text.startswith('```json'):
+        result_text = result_text.split('```json')[1].split('```')[0].strip()
+    elif result_text.startswith('```'):
+        result_text = result_text.split('```')[1].split('```')[0].strip()
+    
+    return json.loads(result_text)
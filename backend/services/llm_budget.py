@@ -0,0 +1,72 @@
+import os
+import time
+from typing import Dict, Optional
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for budgeting"""
+    return len(text) // 4 + 1
+
+def _env_limit(name: str, cast):
+    value = cast(os.getenv(name, "0") or 0)
+    return value if value > 0 else None
+
+class LLMBudget:
+    """Caps the LLM work a single workflow execution may trigger.
+    
+    Any limit left as None is unlimited. The matcher asks `allows(prompt)`
+    before each call and charges the prompt and response afterwards; once the
+    budget is spent the remaining jobs are scored locally instead.
+    """
+    
+    def __init__(self, max_calls: Optional[int] = None, max_tokens: Optional[int] = None, max_seconds: Optional[float] = None):
+        self.max_calls = max_calls
+        self.max_tokens = max_tokens
+        self.max_seconds = max_seconds
+        self.started = time.monotonic()
+        self.calls = 0
+        self.tokens = 0
+        self.exhausted: Optional[str] = None  # Which limit stopped LLM scoring
+    
+    @classmethod
+    def from_limits(cls, max_calls: Optional[int] = None, max_tokens: Optional[int] = None,
+                    max_seconds: Optional[float] = None) -> "LLMBudget":
+        """Build a budget, falling back to the LLM_MAX_*_PER_RUN env defaults"""
+        return cls(
+            max_calls=max_calls if max_calls is not None else _env_limit("LLM_MAX_CALLS_PER_RUN", int),
+            max_tokens=max_tokens if max_tokens is not None else _env_limit("LLM_MAX_TOKENS_PER_RUN", int),
+            max_seconds=max_seconds if max_seconds is not None else _env_limit("LLM_MAX_SECONDS_PER_RUN", float)
+        )
+    
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+    
+    def remaining_seconds(self) -> Optional[float]:
+        """Time left for an in-flight call (None when there is no time limit)"""
+        if self.max_seconds is None:
+            return None
+        return max(self.max_seconds - self.elapsed(), 0.0)
+    
+    def allows(self, prompt: str) -> bool:
+        """True if one more call with this prompt fits in the budget"""
+        if self.exhausted:
+            return False
+        if self.max_calls is not None and self.calls >= self.max_calls:
+            self.exhausted = "calls"
+        elif self.max_tokens is not None and self.tokens + estimate_tokens(prompt) > self.max_tokens:
+            self.exhausted = "tokens"
+        elif self.max_seconds is not None and self.elapsed() >= self.max_seconds:
+            self.exhausted = "seconds"
+        return self.exhausted is None
+    
+    def charge(self, prompt: str, response: str = ""):
+        """Record a call (charged even if it failed, since it was sent)"""
+        self.calls += 1
+        self.tokens += estimate_tokens(prompt) + (estimate_tokens(response) if response else 0)
+    
+    def summary(self) -> Dict:
+        return {
+            "llm_calls": self.calls,
+            "llm_tokens": self.tokens,
+            "seconds": round(self.elapsed(), 3),
+            "exhausted": self.exhausted
+        }
@@ -0,0 +1,230 @@
+import asyncio
+import contextvars
+import os
+import random
+import re
+import time
+from collections import OrderedDict, deque, Counter
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from services.llm_budget import estimate_tokens
+
+INTERACTIVE = 0  # A user is waiting on the response (workflow runs, uploads)
+BATCH = 1        # Scheduled work such as delta matching digests
+
+# Who the current LLM call is made for; set by the API layer and inherited by
+# every task the request spawns
+_caller: contextvars.ContextVar[Tuple[str, int]] = contextvars.ContextVar("llm_caller", default=("anonymous", INTERACTIVE))
+
+@contextmanager
+def llm_caller(user_id: str, priority: int = INTERACTIVE):
+    """Attribute LLM calls made inside the block to `user_id` at `priority`"""
+    token = _caller.set((user_id, priority))
+    try:
+        yield
+    finally:
+        _caller.reset(token)
+
+def current_caller() -> Tuple[str, int]:
+    return _caller.get()
+
+def is_rate_limited(error: Exception) -> bool:
+    """True for provider quota errors (HTTP 429 / ResourceExhausted)"""
+    return (type(error).__name__ in ("ResourceExhausted", "TooManyRequests")
+            or getattr(error, "code", None) == 429
+            or re.search(r"\b429\b", str(error)) is not None)
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Server-suggested delay in seconds, if the error carries one"""
+    match = re.search(r"retry[_ ]delay\D*?(\d+(?:\.\d+)?)", str(error), re.IGNORECASE)
+    return float(match.group(1)) if match else None
+
+class TokenBucket:
+    """Refills at `per_minute / 60` units a second and holds `burst_seconds` of quota"""
+    
+    def __init__(self, per_minute: float, burst_seconds: float = 10):
+        self.rate = per_minute / 60
+        self.capacity = max(self.rate * burst_seconds, 1)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` can be taken (oversized requests wait for a full bucket)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+    
+    def consume(self, amount: float):
+        """Take `amount` (may go negative, e.g. when actual usage beats the estimate)"""
+        self._refill()
+        self.level -= amount
+
+class _Waiter:
+    __slots__ = ("future", "tokens")
+    
+    def __init__(self, future: asyncio.Future, tokens: int):
+        self.future = future
+        self.tokens = tokens
+
+class LLMScheduler:
+    """Process-wide admission control for Gemini calls.
+    
+    Calls queue per priority and, within a priority, per user; the dispatcher
+    serves interactive work first and takes one call per user in turn, so a
+    large run can't starve other users. A call is admitted when a concurrency
+    slot is free and the requests-per-minute and tokens-per-minute buckets
+    allow it. A 429 pauses admission for everyone (the quota is shared) with
+    exponential backoff, and the call is queued again.
+    """
+    
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 max_concurrency: int = 8, max_retries: int = 4, base_backoff: float = 1.0, output_tokens: int = 256):
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.output_tokens = output_tokens  # Reserved per call until actual usage is known
+        self.stats = Counter()
+        self._loop = None
+    
+    def _bind_loop(self):
+        """(Re)create per-loop state; asyncio primitives can't cross event loops"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queues: Dict[int, "OrderedDict[str, deque]"] = {}
+            self._changed = asyncio.Event()
+            self._dispatcher: Optional[asyncio.Task] = None
+            self._in_flight = 0
+            self._paused_until = 0.0
+    
+    def queued(self) -> int:
+        if self._loop is None:
+            return 0
+        return sum(len(waiters) for users in self._queues.values() for waiters in users.values())
+    
+    async def run(self, prompt: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `call` (which sends `prompt`) once admitted, retrying on 429s"""
+        self._bind_loop()
+        user_id, priority = current_caller()
+        tokens = estimate_tokens(prompt) + self.output_tokens
+        
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(user_id, priority, tokens)
+            try:
+                response = await call()
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == self.max_retries:
+                    raise
+                delay = retry_after(e) or self.base_backoff * 2 ** attempt * (0.5 + random.random())
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+                self.stats["rate_limited"] += 1
+                print(f"LLM rate limited, backing off {delay:.1f}s (attempt {attempt + 1})")
+                continue
+            finally:
+                self._release()
+            
+            # Settle the token reservation against what the call really used
+            usage = getattr(getattr(response, "usage_metadata", None), "total_token_count", None)
+            if self.token_bucket and isinstance(usage, int):
+                self.token_bucket.consume(usage - tokens)
+            self.stats["completed"] += 1
+            return response
+    
+    async def _acquire(self, user_id: str, priority: int, tokens: int):
+        waiter = _Waiter(self._loop.create_future(), tokens)
+        users = self._queues.setdefault(priority, OrderedDict())
+        users.setdefault(user_id, deque()).append(waiter)
+        self._changed.set()
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            # Cancelled right after being admitted: give the slot back
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release()
+            raise
+    
+    def _release(self):
+        self._in_flight -= 1
+        self._changed.set()
+    
+    def _next(self, pop: bool = False) -> Optional[_Waiter]:
+        """Head of the highest-priority queue, round-robin across its users"""
+        for priority in sorted(self._queues):
+            users = self._queues[priority]
+            while users:
+                user_id, waiters = next(iter(users.items()))
+                while waiters and waiters[0].future.done():  # Caller gave up
+                    waiters.popleft()
+                if not waiters:
+                    del users[user_id]
+                    continue
+                if not pop:
+                    return waiters[0]
+                waiter = waiters.popleft()
+                del users[user_id]
+                if waiters:
+                    users[user_id] = waiters  # Back of the line for this user
+                return waiter
+        return None
+    
+    def _wait_time(self, tokens: int) -> float:
+        waits = [self._paused_until - time.monotonic()]
+        if self.request_bucket:
+            waits.append(self.request_bucket.time_until(1))
+        if self.token_bucket:
+            waits.append(self.token_bucket.time_until(tokens))
+        return max(waits + [0.0])
+    
+    async def _dispatch(self):
+        while True:
+            waiter = self._next()
+            if waiter is None:
+                return
+            
+            wait = None if self._in_flight >= self.max_concurrency else self._wait_time(waiter.tokens)
+            if wait == 0:
+                self._next(pop=True)
+                if self.request_bucket:
+                    self.request_bucket.consume(1)
+                if self.token_bucket:
+                    self.token_bucket.consume(waiter.tokens)
+                self._in_flight += 1
+                waiter.future.set_result(None)
+                continue
+            
+            # Wake on a released slot or a new arrival, or when the buckets refill
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+_scheduler = None
+
+def get_scheduler() -> LLMScheduler:
+    """Return the process-wide scheduler, configured from the environment"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = LLMScheduler(
+            requests_per_minute=float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0")) or None,
+            tokens_per_minute=float(os.getenv("LLM_TOKENS_PER_MINUTE", "0")) or None,
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "4"))
+        )
+    return _scheduler
+
+def set_scheduler(scheduler: LLMScheduler):
+    """Replace the shared scheduler (used by tests and the load-testing harness)"""
+    global _scheduler
+    _scheduler = scheduler
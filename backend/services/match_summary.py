@@ -0,0 +1,85 @@
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from models.job import JobRecord
+
+# Characters of description kept per summarized match; keeps the document a fixed size
+SUMMARY_DESCRIPTION_LENGTH = 300
+
+class MatchSummaries:
+    """Per-user summary documents in `user_match_summaries`.
+    
+    Each workflow (and delta) run folds its matches into one document per
+    user: the `top_n` best current matches with the fields the results page
+    renders, match counts per source, and the last execution's status and
+    timestamps. Dashboard reads are then a point lookup on the unique
+    `user_id` index instead of a scan of the user's whole `job_matches`
+    history. A job re-matched in a later run replaces its earlier entry but
+    is counted again in `source_counts`.
+    """
+    
+    def __init__(self, db, top_n: int = 20):
+        self.collection = db.user_match_summaries
+        self.top_n = top_n
+    
+    async def ensure_indexes(self):
+        await self.collection.create_index("user_id", unique=True)
+    
+    async def get(self, user_id: str) -> Dict:
+        """The user's summary, or an empty one if nothing has been recorded yet"""
+        summary = await self.collection.find_one({"user_id": user_id}, {"_id": 0})
+        return summary or {
+            "user_id": user_id,
+            "top_matches": [],
+            "source_counts": {},
+            "total_matches": 0,
+            "last_execution": None,
+            "updated_at": None
+        }
+    
+    async def record(self, user_id: str, matched: List[JobRecord], matched_at: Optional[str] = None,
+                     execution: Optional[Dict] = None):
+        """Merge `matched` into the user's top matches and counts, and store `execution` if given"""
+        now = datetime.now(timezone.utc).isoformat()
+        matched_at = matched_at or now
+        entries = {job.fingerprint: self._entry(job, matched_at) for job in matched}
+        
+        update = {"$set": {"updated_at": now}}
+        if execution is not None:
+            update["$set"]["last_execution"] = execution
+        if entries:
+            # Drop earlier entries for re-matched jobs first ($pull and $push
+            # can't target the same field in one update)
+            await self.collection.update_one(
+                {"user_id": user_id},
+                {"$pull": {"top_matches": {"job_fingerprint": {"$in": list(entries)}}}}
+            )
+            counts = Counter(job.source for job in matched)
+            update["$push"] = {"top_matches": {
+                "$each": list(entries.values()),
+                "$sort": {"match_score": -1, "matched_at": -1},
+                "$slice": self.top_n
+            }}
+            update["$inc"] = {
+                "total_matches": len(matched),
+                **{f"source_counts.{source}": count for source, count in counts.items()}
+            }
+        await self.collection.update_one({"user_id": user_id}, update, upsert=True)
+    
+    def _entry(self, job: JobRecord, matched_at: str) -> Dict:
+        return {
+            "job_fingerprint": job.fingerprint,
+            "job_id": job.job_id,
+            "source": job.source,
+            "title": job.title,
+            "company": job.company,
+            "location": job.location,
+            "salary": job.salary,
+            "url": job.url,
+            "description": (job.description or "")[:SUMMARY_DESCRIPTION_LENGTH],
+            "match_score": job.match_score or 0,
+            "match_reason": job.match_reason or "",
+            "scorer": job.scorer,
+            "matched_at": matched_at
+        }
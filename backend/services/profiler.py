@@ -0,0 +1,180 @@
+import asyncio
+import contextvars
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from pymongo import monitoring
+
+# Profile of the execution the current task belongs to; inherited by every
+# task the workflow spawns and (through Motor) by its Mongo executor threads
+_active: contextvars.ContextVar[Optional["ExecutionProfile"]] = contextvars.ContextVar("execution_profile", default=None)
+
+def should_profile(requested: bool = False) -> bool:
+    """Profile when the request asks for it, or for a PROFILE_SAMPLE_RATE fraction of runs"""
+    return requested or random.random() < float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+
+@contextmanager
+def span(kind: str, name: str):
+    """Record the block on the active profile's timeline (no-op when not profiling)"""
+    profile = _active.get()
+    if profile is None:
+        yield
+        return
+    
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        profile.add_span(kind, name, start, time.perf_counter(), error)
+
+def _task_name() -> Optional[str]:
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:  # Not on the event loop (e.g. a Motor executor thread)
+        return threading.current_thread().name
+    return task.get_name() if task else None
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack every `interval` seconds.
+    
+    Stacks are collapsed into "file:function;..." strings (root first), the
+    format flame-graph tools read. The event loop thread is shared by every
+    request, so samples include whatever else the server was doing; the span
+    timeline is what isolates this execution.
+    """
+    
+    def __init__(self, thread_id: int, interval: float = 0.005, max_depth: int = 64):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks = Counter()
+        self.samples = 0
+        self._stopped = threading.Event()
+    
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+    
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+class ExecutionProfile:
+    """Sampling profile plus async span timeline for one workflow execution"""
+    
+    def __init__(self, sample_interval: float = 0.005, max_spans: int = 5000, max_stacks: int = 500):
+        self.sample_interval = sample_interval
+        self.max_spans = max_spans
+        self.max_stacks = max_stacks
+        self.spans: List[Dict] = []
+        self.dropped_spans = 0
+        self.started = None
+        self.duration = 0.0
+        self._sampler = None
+        self._lock = threading.Lock()  # Spans also arrive from Mongo executor threads
+    
+    def start(self):
+        self.started = time.perf_counter()
+        self._sampler = StackSampler(threading.get_ident(), self.sample_interval)
+        self._sampler.start()
+    
+    def stop(self):
+        self.duration = time.perf_counter() - self.started
+        self._sampler.stop()
+    
+    def add_span(self, kind: str, name: str, start: float, end: float, error: Optional[str] = None):
+        with self._lock:
+            if len(self.spans) >= self.max_spans:
+                self.dropped_spans += 1
+                return
+            self.spans.append({
+                "kind": kind,
+                "name": name,
+                "task": _task_name(),
+                "start_ms": round((start - self.started) * 1000, 2),
+                "duration_ms": round((end - start) * 1000, 2),
+                "error": error
+            })
+    
+    def to_document(self) -> Dict:
+        """Summary for `workflow_profiles`, bounded in size"""
+        span_totals = Counter()
+        for recorded in self.spans:
+            span_totals[recorded["kind"]] += recorded["duration_ms"]
+        
+        stacks = self._sampler.stacks
+        leaf_counts = Counter()
+        for stack, count in stacks.items():
+            leaf_counts[stack.rsplit(";", 1)[-1]] += count
+        
+        return {
+            "duration_ms": round(self.duration * 1000, 2),
+            "sample_interval_ms": self.sample_interval * 1000,
+            "samples": self._sampler.samples,
+            "stacks": [{"stack": stack, "count": count} for stack, count in stacks.most_common(self.max_stacks)],
+            "top_functions": [{"function": name, "samples": count} for name, count in leaf_counts.most_common(50)],
+            "span_totals_ms": {kind: round(total, 2) for kind, total in span_totals.items()},
+            "spans": sorted(self.spans, key=lambda recorded: recorded["start_ms"]),
+            "dropped_spans": self.dropped_spans
+        }
+
+@contextmanager
+def profiling(enabled: bool, sample_interval: Optional[float] = None):
+    """Profile the block if `enabled`, yielding the ExecutionProfile (or None)"""
+    if not enabled:
+        yield None
+        return
+    
+    profile = ExecutionProfile(sample_interval or float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005")))
+    token = _active.set(profile)
+    profile.start()
+    try:
+        yield profile
+    finally:
+        profile.stop()
+        _active.reset(token)
+
+class MongoCommandSpans(monitoring.CommandListener):
+    """Adds each Mongo command run for a profiled execution to its timeline"""
+    
+    def __init__(self):
+        self._pending: Dict[int, tuple] = {}
+    
+    def started(self, event):
+        profile = _active.get()
+        if profile is not None:
+            collection = event.command.get(event.command_name)
+            name = f"{event.command_name} {collection}" if isinstance(collection, str) else event.command_name
+            self._pending[event.request_id] = (profile, name, time.perf_counter())
+    
+    def succeeded(self, event):
+        self._finish(event, None)
+    
+    def failed(self, event):
+        self._finish(event, event.failure.get("codeName", "error") if isinstance(event.failure, dict) else "error")
+    
+    def _finish(self, event, error: Optional[str]):
+        pending = self._pending.pop(event.request_id, None)
+        if pending is not None:
+            profile, name, start = pending
+            profile.add_span("db", name, start, time.perf_counter(), error)
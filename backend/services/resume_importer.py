@@ -0,0 +1,253 @@
+import asyncio
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime, timezone
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from models.resume import Resume, ResumeImport, ResumeImportFile
+from services.cpu_pool import run_cpu_bound
+from services.llm_scheduler import BATCH
+from services.resume_parser import extract_resume_text
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+
+# (file name, spilled upload path, archive member or None)
+ImportEntry = Tuple[str, str, Optional[str]]
+
+def extract_entry_text(file_name: str, path: str, member: Optional[str], max_bytes: int) -> Tuple[str, str]:
+    """(file_type, text) for one import entry; runs in the CPU pool.
+    
+    `path` is the spilled upload: the resume itself, or the archive holding
+    `member`. Members are decompressed here rather than on the event loop,
+    and reading stops after `max_bytes` in case the archive understated the size.
+    """
+    if member is None:
+        with open(path, "rb") as f:
+            content = f.read(max_bytes + 1)
+    else:
+        with zipfile.ZipFile(path) as archive, archive.open(member) as f:
+            content = f.read(max_bytes + 1)
+    if len(content) > max_bytes:
+        raise ValueError(f"File is larger than {max_bytes // (1024 * 1024)} MB")
+    return extract_resume_text(file_name, content)
+
+class ResumeImporter:
+    """Bulk resume onboarding (a bootcamp class, an agency's candidates).
+    
+    `start` lists the entries of the uploaded files (zip archives are
+    expanded from their central directory, nothing is read or decompressed
+    yet) and rejects the upload if any file is over `max_file_bytes` or all
+    of them together are over `max_total_bytes` uncompressed. Uploads are
+    copied to temp files, so the background work doesn't keep them in memory
+    and pool workers can open them by path. It then stores a
+    `resume_imports` record with one status per file and returns it as the
+    job handle. The entries are processed in the background: each is
+    decompressed and its text extracted in the CPU pool (`concurrency` at a time),
+    extracted resumes are inserted `batch_size` at a time, and each is handed
+    to the ResumeProcessor for skill parsing at BATCH priority under the
+    importer's name, so one large import shares the LLM quota fairly.
+    
+    A file named after an email address (`jane@example.com.pdf`) is imported
+    for that user; anything else belongs to the importing account.
+    """
+    
+    def __init__(self, db, resume_processor, batch_size: int = 50, max_files: int = 1000,
+                 max_file_bytes: int = 10 * 1024 * 1024, max_total_bytes: int = 500 * 1024 * 1024,
+                 concurrency: Optional[int] = None):
+        self.db = db
+        self.resume_processor = resume_processor
+        self.batch_size = batch_size
+        self.max_files = max_files
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self.concurrency = concurrency or (os.cpu_count() or 1) * 2
+        self._tasks = set()
+    
+    async def ensure_indexes(self):
+        await self.db.resume_imports.create_index("id", unique=True)
+    
+    async def start(self, owner_email: str, uploads: List[Tuple[str, BinaryIO]]) -> Dict:
+        """Record the import and start processing it; raises ValueError for an unusable batch.
+        
+        `uploads` are (file name, seekable binary file) pairs, e.g. the
+        spooled files of FastAPI UploadFiles; they are copied before returning.
+        """
+        entries = await asyncio.to_thread(self._entries, uploads)
+        if not entries:
+            raise ValueError("No resume files found in the upload")
+        if len(entries) > self.max_files:
+            raise ValueError(f"Too many files in one import ({len(entries)} > {self.max_files})")
+        
+        entries, spilled = await asyncio.to_thread(self._spill, entries)
+        try:
+            record = ResumeImport(
+                owner_email=owner_email,
+                total=len(entries),
+                files=[ResumeImportFile(file_name=name, user_id=self._user_for(name, owner_email)) for name, _, _ in entries]
+            ).model_dump()
+            record["created_at"] = record["created_at"].isoformat()
+            await self.db.resume_imports.insert_one(record)
+            record.pop("_id", None)
+        except BaseException:
+            self._remove(spilled)
+            raise
+        
+        task = asyncio.create_task(self._run(record, entries, spilled))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return record
+    
+    async def get(self, import_id: str) -> Optional[Dict]:
+        """The import record, with each file's live skill-parsing status"""
+        record = await self.db.resume_imports.find_one({"id": import_id}, {"_id": 0})
+        if not record:
+            return None
+        
+        resume_ids = [entry["resume_id"] for entry in record["files"] if entry.get("resume_id")]
+        statuses = {
+            resume["id"]: resume.get("parse_status", "pending")
+            async for resume in self.db.resumes.find({"id": {"$in": resume_ids}}, {"_id": 0, "id": 1, "parse_status": 1})
+        }
+        for entry in record["files"]:
+            entry["parse_status"] = statuses.get(entry.get("resume_id"))
+        return record
+    
+    def _entries(self, uploads: List[Tuple[str, BinaryIO]]) -> List[Tuple[str, BinaryIO, Optional[str]]]:
+        """One entry per resume file, expanding zip archives from their central
+        directory; raises ValueError if the files are over the size limits"""
+        entries = []
+        total_bytes = 0
+        for file_name, upload in uploads:
+            size = upload.seek(0, os.SEEK_END)
+            if not file_name.lower().endswith(".zip"):
+                self._check_size(file_name, size)
+                total_bytes += size
+                entries.append((file_name, upload, None))
+                continue
+            
+            if size > self.max_total_bytes:
+                raise ValueError(f"{file_name} is larger than {self.max_total_bytes // (1024 * 1024)} MB")
+            try:
+                archive = zipfile.ZipFile(upload)
+            except zipfile.BadZipFile:
+                raise ValueError(f"{file_name} is not a valid zip archive")
+            for info in archive.infolist():
+                name = os.path.basename(info.filename)
+                # Skip folders and OS metadata (__MACOSX/, .DS_Store)
+                if info.is_dir() or not name or name.startswith(".") or info.filename.startswith("__MACOSX/"):
+                    continue
+                self._check_size(f"{file_name}/{info.filename}", info.file_size)
+                total_bytes += info.file_size
+                entries.append((name, upload, info.filename))
+        
+        if total_bytes > self.max_total_bytes:
+            raise ValueError(f"Upload expands to more than {self.max_total_bytes // (1024 * 1024)} MB")
+        return entries
+    
+    def _check_size(self, file_name: str, size: int):
+        if size > self.max_file_bytes:
+            raise ValueError(f"{file_name} is larger than {self.max_file_bytes // (1024 * 1024)} MB")
+    
+    def _spill(self, entries: List[Tuple[str, BinaryIO, Optional[str]]]) -> Tuple[List[ImportEntry], List[str]]:
+        """Copy each upload to a temp file once and point its entries at the path,
+        so pool workers get a path instead of a copy of an archive per member"""
+        paths: Dict[int, str] = {}
+        spilled_entries = []
+        try:
+            for name, upload, member in entries:
+                if id(upload) not in paths:
+                    fd, paths[id(upload)] = tempfile.mkstemp(prefix="resume_import_")
+                    upload.seek(0)
+                    with os.fdopen(fd, "wb") as f:
+                        shutil.copyfileobj(upload, f)
+                spilled_entries.append((name, paths[id(upload)], member))
+        except BaseException:
+            self._remove(list(paths.values()))
+            raise
+        return spilled_entries, list(paths.values())
+    
+    def _remove(self, paths: List[str]):
+        for path in paths:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+    
+    def _user_for(self, file_name: str, owner_email: str) -> str:
+        stem = os.path.splitext(file_name)[0]
+        return stem.lower() if EMAIL_PATTERN.fullmatch(stem) else owner_email
+    
+    async def _run(self, record: Dict, entries: List[ImportEntry], spilled: List[str]):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def extract(index: int, file_name: str, path: str, member: Optional[str]):
+            async with semaphore:
+                try:
+                    file_type, text = await run_cpu_bound(extract_entry_text, file_name, path, member, self.max_file_bytes)
+                    if not text:
+                        raise ValueError("No text could be extracted")
+                    return index, file_type, text, None
+                except Exception as e:
+                    return index, None, None, str(e)
+        
+        imported: List[Tuple[int, Dict]] = []
+        failed: List[Tuple[int, str]] = []
+        try:
+            tasks = [extract(index, file_name, path, member) for index, (file_name, path, member) in enumerate(entries)]
+            for next_done in asyncio.as_completed(tasks):
+                index, file_type, text, error = await next_done
+                if error:
+                    failed.append((index, error))
+                else:
+                    imported.append((index, self._resume(record["files"][index], file_type, text)))
+                if len(imported) >= self.batch_size:
+                    await self._flush(record, imported, failed)
+                    imported, failed = [], []
+            
+            await self._flush(record, imported, failed)
+            status = "completed"
+        except Exception as e:
+            print(f"Error importing resumes for {record['owner_email']}: {str(e)}")
+            status = "failed"
+        finally:
+            await asyncio.to_thread(self._remove, spilled)
+        
+        await self.db.resume_imports.update_one(
+            {"id": record["id"]},
+            {"$set": {"status": status, "completed_at": datetime.now(timezone.utc).isoformat()}}
+        )
+    
+    def _resume(self, entry: Dict, file_type: str, text: str) -> Dict:
+        resume = Resume(
+            user_id=entry["user_id"],
+            resume_text=text,
+            file_name=entry["file_name"],
+            file_type=file_type
+        ).model_dump()
+        resume["uploaded_at"] = resume["uploaded_at"].isoformat()
+        return resume
+    
+    async def _flush(self, record: Dict, imported: List[Tuple[int, Dict]], failed: List[Tuple[int, str]]):
+        """Insert a batch of resumes, queue their parsing and record per-file outcomes"""
+        if not imported and not failed:
+            return
+        
+        if imported:
+            await self.db.resumes.insert_many([resume for _, resume in imported])
+            for _, resume in imported:
+                self.resume_processor.schedule(resume, BATCH, caller=record["owner_email"])
+        
+        update = {}
+        for index, resume in imported:
+            update[f"files.{index}.status"] = "imported"
+            update[f"files.{index}.resume_id"] = resume["id"]
+        for index, error in failed:
+            update[f"files.{index}.status"] = "failed"
+            update[f"files.{index}.error"] = error
+        await self.db.resume_imports.update_one(
+            {"id": record["id"]},
+            {"$set": update, "$inc": {"imported": len(imported), "failed": len(failed)}}
+        )
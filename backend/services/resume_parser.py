@@ -1,63 +1,82 @@
-import PyPDF2
 import io
 import base64
-from typing import Dict, List
-import os
-import google.generativeai as genai
-import json
+import asyncio
+from typing import Dict, List, Tuple
+
+from services import llm
+from services.resume_preprocessor import ResumePreprocessor, merge_extractions
+
+def extract_pdf_text(pdf_bytes: bytes) -> str:
+    """Extract text from PDF bytes (module-level so it can run in the CPU pool)"""
+    import PyPDF2  # Only needed for PDF uploads, keep it off the startup path
+    
+    try:
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+        
+        # Form feeds mark page breaks so running headers/footers can be told apart
+        text = "\f".join(page.extract_text() for page in pdf_reader.pages)
+        
+        return text.strip()
+    except Exception as e:
+        raise Exception(f"Error parsing PDF: {str(e)}")
+
+def extract_resume_text(file_name: str, content: bytes) -> Tuple[str, str]:
+    """(file_type, text) for an uploaded .pdf or plain-text resume file"""
+    if file_name.lower().endswith('.pdf'):
+        return "pdf", extract_pdf_text(content)
+    if file_name.lower().endswith(('.txt', '.md', '.text')):
+        return "text", content.decode('utf-8', errors='replace').strip()
+    raise ValueError(f"Unsupported file type: {file_name}")
 
 class ResumeParser:
-    def __init__(self):
-        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-        self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+    def __init__(self, preprocessor: ResumePreprocessor = None):
+        self.preprocessor = preprocessor or ResumePreprocessor()
     
     def parse_pdf(self, base64_content: str) -> str:
         """Extract text from base64 encoded PDF"""
+        return extract_pdf_text(base64.b64decode(base64_content))
+    
+    async def extract_skills_and_experience(self, resume_text: str) -> Dict:
+        """Use Gemini to extract skills and experience from resume.
+        
+        The text is compacted first; long resumes are split into chunks that
+        are extracted in parallel and merged.
+        """
         try:
-            pdf_bytes = base64.b64decode(base64_content)
-            pdf_file = io.BytesIO(pdf_bytes)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
+            chunks = self.preprocessor.prepare(resume_text).chunks
+            if len(chunks) == 1:
+                return await self._extract(chunks[0])
             
-            return text.strip()
+            results = await asyncio.gather(*[
+                self._extract(chunk, part=f" (part {i + 1} of {len(chunks)})") for i, chunk in enumerate(chunks)
+            ], return_exceptions=True)
+            extracted = [result for result in results if isinstance(result, dict)]
+            for result in results:
+                if isinstance(result, Exception):
+                    print(f"Error parsing resume chunk with Gemini: {str(result)}")
+            if not extracted:
+                raise results[0]
+            return merge_extractions(extracted)
         except Exception as e:
-            raise Exception(f"Error parsing PDF: {str(e)}")
+            print(f"Error parsing resume with Gemini: {str(e)}")
+            # Fallback to basic parsing if Gemini fails
+            return {
+                "skills": [],
+                "experience": "Not specified",
+                "expertise": []
+            }
     
-    async def extract_skills_and_experience(self, resume_text: str) -> Dict:
-        """Use Gemini to extract skills and experience from resume"""
-        try:
-            prompt = f"""Extract the following from this resume and return ONLY valid JSON:
+    async def _extract(self, resume_text: str, part: str = "") -> Dict:
+        prompt = f"""Extract the following from this resume and return ONLY valid JSON:
 1. List of technical skills (programming languages, frameworks, tools)
 2. Years of experience (estimate if not explicitly stated)
 3. Key expertise areas
 
-Resume:
+Resume{part}:
 {resume_text}
 
 Return as JSON with keys: skills (array), experience (string), expertise (array)
 Example: {{"skills": ["Python", "React"], "experience": "5 years", "expertise": ["Web Development"]}}"""
 
-            response = self.model.generate_content(prompt)
-            
-            # Extract JSON from response
-            result_text = response.text.strip()
-            
-            # Try to find JSON in the response
-            if result_text.startswith('```json'):
-                result_text = result_text.split('```json')[1].split('```')[0].strip()
-            elif result_text.startswith('```'):
-                result_text = result_text.split('```')[1].split('```')[0].strip()
-            
-            result = json.loads(result_text)
-            return result
-        except Exception as e:
-            print(f"Error parsing resume with Gemini: {str(e)}")
-            # Fallback to basic parsing if Gemini fails
-            return {
-                "skills": [],
-                "experience": "Not specified",
-                "expertise": []
-            }
\ No newline at end of file
+        result_text = await llm.generate(prompt)
+        return llm.parse_json_response(result_text)
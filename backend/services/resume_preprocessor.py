@@ -0,0 +1,214 @@
+import re
+from collections import Counter
+from typing import Dict, List, Set, Tuple
+
+# Canonical section -> heading pattern (matched against the whole, lowercased heading line)
+SECTION_PATTERNS = {
+    "summary": r"(professional |career )?(summary|profile|objective|about me)",
+    "skills": r"((technical|core|key) )?(skills|competencies|technologies|tech stack|tools)"
+              r"( (and|&) (tools|technologies|competencies))?( summary)?",
+    "experience": r"((professional|work|relevant) )?(experience|employment( history)?|work history|career history)",
+    "projects": r"((personal|selected|key) )?projects",
+    "certifications": r"(certifications?|licenses|awards)( (and|&) (certifications|licenses|awards))?",
+    "education": r"education( (and|&) training)?|academic (background|qualifications)|qualifications",
+    # Sections that say nothing about skills or experience
+    "boilerplate": r"references|hobbies|interests|hobbies (and|&) interests|personal (details|information)|declaration",
+}
+
+# Order of sections in the compacted prompt; "header" is whatever precedes the first heading
+SECTION_ORDER = ["header", "summary", "skills", "experience", "projects", "certifications", "education"]
+
+BOILERPLATE_LINES = [
+    r"references (are )?available (up)?on request\.?",
+    r"page \d+( of \d+)?",
+    r"(curriculum vitae|resume|cv)",
+    r"i hereby declare.*",
+]
+
+CONTACT_PATTERN = re.compile(
+    r"[\w.+-]+@[\w-]+\.[\w.-]+"           # email
+    r"|(https?://|www\.)\S+"               # url
+    r"|(linkedin|github)\.com/\S*"         # profile links
+    # phone: 9+ digits, not starting with a standalone year, so employment
+    # dates ("2015 - 2019", "06/2015 - 08/2019") are not mistaken for one
+    r"|(?<!\d)\+?(?!(19|20)\d\d\b)\d(?:[\s().-]*\d){8,}"
+)
+
+_headings = [(name, re.compile(pattern)) for name, pattern in SECTION_PATTERNS.items()]
+_boilerplate = [re.compile(pattern) for pattern in BOILERPLATE_LINES]
+
+# Line that stands for a page break (extract_pdf_text joins pages with form feeds)
+PAGE_BREAK = "\f"
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse PDF-extraction noise: odd spaces, hyphenated breaks, blank runs"""
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\u00a0", " ").replace("\t", " ")
+    text = text.replace(PAGE_BREAK, f"\n{PAGE_BREAK}\n")  # Page breaks become their own line
+    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)  # Words split across lines
+    lines = [re.sub(r" {2,}", " ", line).strip(" ") for line in text.split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+def _section_of(line: str):
+    """Canonical section name if the line is a heading, else None"""
+    if len(line) > 40:
+        return None
+    heading = re.sub(r"[^a-z& ]", "", line.lower()).strip()
+    for name, pattern in _headings:
+        if pattern.fullmatch(heading):
+            return name
+    return None
+
+def _is_boilerplate(line: str) -> bool:
+    lowered = line.lower().strip(" .:-|")
+    if any(pattern.fullmatch(lowered) for pattern in _boilerplate):
+        return True
+    # Contact lines: nothing left once emails, phones and links are removed
+    remainder = CONTACT_PATTERN.sub("", line)
+    return remainder != line and len(re.sub(r"[^A-Za-z]", "", remainder)) < 3
+
+def _running_lines(lines: List[str], edge_lines: int = 1) -> Set[str]:
+    """Headers/footers: short lines repeated as the first or last line of most pages.
+    
+    Only page edges are considered, so a line repeated in the body (the same
+    job title at three employers) is kept. Text without page breaks has one
+    page and nothing is removed.
+    """
+    pages: List[List[str]] = [[]]
+    for line in lines:
+        if line == PAGE_BREAK:
+            pages.append([])
+        elif line:
+            pages[-1].append(line)
+    pages = [page for page in pages if page]
+    if len(pages) < 2:
+        return set()
+    
+    edges = Counter()
+    for page in pages:
+        edges.update({line for line in page[:edge_lines] + page[-edge_lines:] if len(line) <= 60})
+    return {line for line, count in edges.items() if count >= max(2, (len(pages) + 1) // 2)}
+
+def split_sections(text: str) -> Dict[str, str]:
+    """Group normalized resume lines by detected section, dropping boilerplate"""
+    lines = text.split("\n")
+    repeated = _running_lines(lines)
+    
+    sections: Dict[str, List[str]] = {}
+    current = "header"
+    for line in lines:
+        if line == PAGE_BREAK:
+            continue
+        section = _section_of(line) if line else None
+        if section:
+            current = section
+            continue
+        if current == "boilerplate" or line in repeated or (line and _is_boilerplate(line)):
+            continue
+        sections.setdefault(current, []).append(line)
+    
+    return {
+        name: "\n".join(body).strip()
+        for name, body in sections.items()
+        if name != "boilerplate" and "\n".join(body).strip()
+    }
+
+class PreparedResume:
+    """A resume reduced to the sections worth sending, split into prompt-sized chunks"""
+    
+    def __init__(self, sections: Dict[str, str], text: str, chunks: List[str]):
+        self.sections = sections
+        self.text = text
+        self.chunks = chunks
+
+class ResumePreprocessor:
+    """Shrinks resume text before it is sent to Gemini for extraction.
+    
+    Whitespace is normalized, sections are detected from their headings and
+    reordered (skills and experience first), and contact details, references
+    and repeated page headers are dropped. Text longer than `max_chars` is
+    split into chunks of at most `chunk_chars` on section and line boundaries,
+    so each chunk can be extracted in parallel.
+    """
+    
+    def __init__(self, max_chars: int = 6000, chunk_chars: int = 4000):
+        self.max_chars = max_chars
+        self.chunk_chars = chunk_chars
+    
+    def prepare(self, resume_text: str) -> PreparedResume:
+        normalized = normalize_whitespace(resume_text or "")
+        sections = split_sections(normalized)
+        blocks = self._blocks(sections)
+        text = "\n\n".join(self._render(heading, body) for heading, body in blocks) or normalized
+        
+        if len(text) <= self.max_chars:
+            return PreparedResume(sections, text, [text])
+        return PreparedResume(sections, text, self._chunk(blocks))
+    
+    def _blocks(self, sections: Dict[str, str]) -> List[Tuple[str, str]]:
+        ordered = [name for name in SECTION_ORDER if name in sections]
+        ordered += [name for name in sections if name not in ordered]
+        return [(name, sections[name]) for name in ordered]
+    
+    def _render(self, heading: str, body: str) -> str:
+        return body if heading == "header" else f"{heading.upper()}:\n{body}"
+    
+    def _chunk(self, blocks: List[Tuple[str, str]]) -> List[str]:
+        """Fill chunks line by line, repeating a section's heading where it is split"""
+        chunks: List[str] = []
+        current: List[str] = []
+        size = 0
+        
+        for heading, body in blocks:
+            title = None if heading == "header" else f"{heading.upper()}:"
+            needs_title = title is not None
+            for line in body.split("\n"):
+                while True:
+                    overhead = len(title) + 2 if needs_title else 0
+                    if current and size + overhead + len(line) + 1 > self.chunk_chars:
+                        chunks.append("\n".join(current).strip())
+                        current, size = [], 0
+                        needs_title = title is not None
+                        continue
+                    if needs_title:
+                        if current:
+                            current.append("")
+                        current.append(title)
+                        size += overhead
+                        needs_title = False
+                    # Hard-split a line that can't fit on its own (e.g. text with no newlines)
+                    room = max(self.chunk_chars - size - 1, 1)
+                    current.append(line[:room])
+                    size += len(line[:room]) + 1
+                    line = line[room:]
+                    if not line:
+                        break
+        
+        if current:
+            chunks.append("\n".join(current).strip())
+        return [chunk for chunk in chunks if chunk]
+
+def _years(experience: str) -> float:
+    match = re.search(r"(\d+(?:\.\d+)?)\s*\+?\s*(years|yrs)", experience or "", re.IGNORECASE)
+    return float(match.group(1)) if match else -1
+
+def merge_extractions(results: List[Dict]) -> Dict:
+    """Combine per-chunk extractions: union skills/expertise, keep the longest experience"""
+    merged = {"skills": [], "experience": "Not specified", "expertise": []}
+    seen = {"skills": set(), "expertise": set()}
+    best_years = -1.0
+    
+    for result in results:
+        for key in ("skills", "expertise"):
+            for item in result.get(key) or []:
+                if isinstance(item, str) and item.strip() and item.strip().lower() not in seen[key]:
+                    seen[key].add(item.strip().lower())
+                    merged[key].append(item.strip())
+        
+        experience = result.get("experience")
+        if isinstance(experience, str) and experience.strip() and experience != "Not specified":
+            years = _years(experience)
+            if years > best_years or merged["experience"] == "Not specified":
+                best_years = max(years, best_years)
+                merged["experience"] = experience
+    
+    return merged
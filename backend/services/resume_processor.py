@@ -0,0 +1,100 @@
+import asyncio
+import hashlib
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from services.llm_scheduler import llm_caller, INTERACTIVE
+from services.resume_preprocessor import normalize_whitespace
+
+class ResumeProcessor:
+    """Parses resumes in the background as soon as they are stored.
+    
+    `schedule` starts one task per resume id; `ensure_parsed` (used by the
+    workflow) joins the in-flight task instead of starting a second parse.
+    Besides the extracted skills, each resume gets a `text_fingerprint`, so a
+    re-upload of identical text reuses the earlier parse without an LLM call,
+    and its skill embedding for catalog shortlisting. Another worker process
+    that hasn't seen the task simply parses on demand.
+    """
+    
+    def __init__(self, db, resume_parser, embedder=None):
+        self.db = db
+        self.resume_parser = resume_parser
+        self.embedder = embedder
+        self._tasks: Dict[str, asyncio.Task] = {}
+    
+    def schedule(self, resume: Dict, priority: int = INTERACTIVE, caller: Optional[str] = None) -> asyncio.Task:
+        """Start parsing `resume` (id, user_id, resume_text) unless already in flight.
+        
+        LLM calls are attributed to `caller` (default: the resume's user) in the scheduler.
+        """
+        task = self._tasks.get(resume["id"])
+        if task is None:
+            task = asyncio.create_task(self._process(resume, priority, caller or resume.get("user_id", "anonymous")))
+            self._tasks[resume["id"]] = task
+            task.add_done_callback(lambda t: self._finished(resume["id"], t))
+        return task
+    
+    def _finished(self, resume_id: str, task: asyncio.Task):
+        self._tasks.pop(resume_id, None)
+        # Already logged in _process; retrieve it so an unawaited failure isn't reported again
+        if not task.cancelled():
+            task.exception()
+    
+    def in_flight(self, resume_id: str) -> bool:
+        return resume_id in self._tasks
+    
+    async def ensure_parsed(self, resume: Dict) -> Dict:
+        """Parsed fields for `resume`, waiting on (or starting) its background parse"""
+        if resume.get("parsed_skills"):
+            return self._parsed_fields(resume)
+        task = self._tasks.get(resume["id"]) or self.schedule(resume)
+        # Shielded so a cancelled workflow doesn't abort the shared parse
+        return await asyncio.shield(task)
+    
+    async def _process(self, resume: Dict, priority: int, caller: str) -> Dict:
+        text = resume.get("resume_text", "")
+        fingerprint = hashlib.sha1(normalize_whitespace(text).encode("utf-8")).hexdigest()
+        
+        try:
+            await self._set_status(resume["id"], {"parse_status": "parsing", "text_fingerprint": fingerprint})
+            
+            # Identical text was parsed before (e.g. the same file uploaded again)
+            previous = await self.db.resumes.find_one(
+                {"text_fingerprint": fingerprint, "parsed_skills.0": {"$exists": True}},
+                {"_id": 0, "parsed_skills": 1, "parsed_experience": 1, "expertise": 1}
+            )
+            if previous:
+                parsed = self._parsed_fields(previous)
+            else:
+                with llm_caller(caller, priority):
+                    data = await self.resume_parser.extract_skills_and_experience(text)
+                parsed = {
+                    "parsed_skills": data.get("skills", []),
+                    "parsed_experience": data.get("experience", ""),
+                    "expertise": data.get("expertise", [])
+                }
+            
+            update = {
+                **parsed,
+                "parse_status": "parsed" if parsed["parsed_skills"] else "failed",
+                "parsed_at": datetime.now(timezone.utc).isoformat()
+            }
+            if self.embedder is not None:
+                update["skill_embedding"] = self.embedder.embed_resume(parsed).tolist()
+            await self._set_status(resume["id"], update)
+            return parsed
+        except Exception as e:
+            print(f"Error processing resume {resume['id']}: {str(e)}")
+            await self._set_status(resume["id"], {"parse_status": "failed"})
+            raise
+    
+    async def _set_status(self, resume_id: str, fields: Dict):
+        await self.db.resumes.update_one({"id": resume_id}, {"$set": fields})
+    
+    def _parsed_fields(self, resume: Dict) -> Dict:
+        return {
+            "parsed_skills": resume.get("parsed_skills", []),
+            "parsed_experience": resume.get("parsed_experience", ""),
+            "expertise": resume.get("expertise", [])
+        }
@@ -0,0 +1,36 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    """Coalesces identical concurrent calls into one in-flight task.
+    
+    The first caller for a key starts the work; callers arriving while it is
+    still running await the same task and get the same result (or exception).
+    The key is forgotten as soon as the task finishes, so this deduplicates
+    bursts without caching anything. Waiters are shielded: one caller being
+    cancelled (e.g. by a timeout) doesn't cancel the work for the others.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.shared = 0  # Calls that joined an in-flight task instead of starting one
+    
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        # A task left behind by a closed event loop (tests, scripts) can't be joined
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.started += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+    
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
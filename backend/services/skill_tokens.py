@@ -0,0 +1,115 @@
+import re
+from typing import List, Iterable
+
+# Spellings that should index as the same skill
+SKILL_ALIASES = {
+    "js": "javascript",
+    "ts": "typescript",
+    "golang": "go",
+    "node": "nodejs",
+    "node.js": "nodejs",
+    "react.js": "react",
+    "reactjs": "react",
+    "vue.js": "vue",
+    "vuejs": "vue",
+    "next.js": "nextjs",
+    "postgres": "postgresql",
+    "k8s": "kubernetes",
+    "py": "python",
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "nlp": "natural language processing",
+    "gcp": "google cloud",
+    "amazon web services": "aws",
+}
+
+# Multi-word skills kept as a single token in addition to their words
+SKILL_PHRASES = {
+    "machine learning", "deep learning", "data science", "data engineering",
+    "computer vision", "natural language processing", "artificial intelligence",
+    "google cloud", "react native", "ruby on rails",
+    "spring boot", "full stack", "distributed systems", "product management",
+}
+
+# Known single-word skills. Descriptions only contribute tokens from this list
+# (plus SKILL_PHRASES and alias targets); free words would turn the catalog's
+# skill index into a general word index ("scalable", "passionate", ...).
+SKILL_VOCABULARY = {
+    # Languages
+    "python", "java", "javascript", "typescript", "go", "rust", "ruby", "php",
+    "c++", "c#", "scala", "kotlin", "swift", "objective-c", "elixir", "erlang",
+    "haskell", "clojure", "perl", "lua", "dart", "julia", "matlab", "sql",
+    "bash", "powershell", "solidity", "html", "css", "sass", "graphql",
+    # Frameworks and libraries
+    "react", "vue", "angular", "svelte", "nextjs", "nuxt", "nodejs", "express",
+    "nestjs", "django", "flask", "fastapi", "rails", "spring", "laravel",
+    ".net", "asp.net", "redux", "jquery", "tailwind", "bootstrap", "flutter",
+    "pandas", "numpy", "scipy", "pytorch", "tensorflow", "keras", "sklearn",
+    "scikit-learn", "spark", "pyspark", "hadoop", "airflow", "dbt", "kafka",
+    "rabbitmq", "celery", "langchain", "opencv", "selenium", "cypress", "jest",
+    "pytest", "junit", "webpack", "vite", "grpc", "rest", "microservices",
+    # Data stores
+    "postgresql", "mysql", "sqlite", "mongodb", "redis", "elasticsearch",
+    "cassandra", "dynamodb", "snowflake", "bigquery", "redshift", "oracle",
+    "neo4j", "clickhouse", "databricks",
+    # Cloud, infrastructure and tooling
+    "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "ansible",
+    "jenkins", "git", "github", "gitlab", "linux", "unix", "nginx", "serverless",
+    "lambda", "ec2", "s3", "helm", "prometheus", "grafana", "datadog", "ci/cd",
+    "devops", "sre", "mlops", "llm", "llms", "figma", "tableau", "excel", "jira",
+    "salesforce", "sap", "unity", "unreal", "ios", "android", "blockchain",
+    # Disciplines
+    "frontend", "backend", "fullstack", "security", "cybersecurity", "analytics",
+    "statistics", "etl", "embedded", "firmware", "networking", "qa", "ux", "ui",
+}
+
+_KNOWN_SKILLS = SKILL_VOCABULARY | SKILL_PHRASES | set(SKILL_ALIASES.values())
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "our", "the", "to", "we", "with", "you", "your",
+    "will", "this", "that", "job", "jobs", "role", "team", "work", "remote",
+    "view", "details", "opportunity", "experience", "years", "year", "strong",
+    "senior", "junior", "lead", "engineer", "developer", "engineering",
+    "development", "inc", "llc", "new", "etc",
+}
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+def _words(text: str) -> List[str]:
+    return [word.rstrip(".") for word in _WORD_RE.findall(text.lower())]
+
+def extract_skill_tokens(text: str) -> List[str]:
+    """Normalize free text (a job title/description or a resume skill) into skill tokens.
+    
+    Words are lower-cased and de-aliased, stopwords are dropped, and known
+    multi-word skills are added as phrase tokens. The result is de-duplicated
+    and keeps first-seen order.
+    """
+    words = _words(text or "")
+    tokens = []
+    
+    for size in (3, 2):
+        for i in range(len(words) - size + 1):
+            phrase = " ".join(words[i:i+size])
+            if phrase in SKILL_PHRASES or phrase in SKILL_ALIASES:
+                tokens.append(SKILL_ALIASES.get(phrase, phrase))
+    
+    for word in words:
+        word = SKILL_ALIASES.get(word, word)
+        if word and word not in STOPWORDS and not word.isdigit():
+            tokens.append(word)
+    
+    return list(dict.fromkeys(tokens))
+
+def extract_known_skill_tokens(text: str) -> List[str]:
+    """Skill tokens of free text restricted to known skills (SKILL_VOCABULARY,
+    SKILL_PHRASES and alias targets); used for job descriptions"""
+    return [token for token in extract_skill_tokens(text) if token in _KNOWN_SKILLS]
+
+def extract_skill_tokens_from_list(skills: Iterable[str]) -> List[str]:
+    """Skill tokens for a list of skills, e.g. a resume's parsed_skills"""
+    tokens = []
+    for skill in skills or []:
+        tokens.extend(extract_skill_tokens(skill))
+    return list(dict.fromkeys(tokens))
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Tests import services the way server.py does (`from services.x import Y`)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from models.job import JobRecord
+from services.embedding_index import EmbeddingIndex, HashingEmbedder
+
+
+def unit_vector(dim, index):
+    vector = np.zeros(dim, dtype=np.float32)
+    vector[index] = 1.0
+    return vector
+
+
+@pytest.mark.parametrize("leftover", [
+    unit_vector(8, 5).tobytes(),        # Whole row, writer died before appending its id
+    unit_vector(8, 5).tobytes()[:10],   # Partial row
+])
+def test_rows_without_an_id_do_not_shift_later_rows(tmp_path, leftover):
+    index = EmbeddingIndex(str(tmp_path), dim=8)
+    index.add(["a"], np.stack([unit_vector(8, 0)]))
+    with open(index.vectors_path, "ab") as f:
+        f.write(leftover)
+    
+    index.add(["b"], np.stack([unit_vector(8, 1)]))
+    
+    assert index.search(unit_vector(8, 1), k=1) == [("b", 1.0)]
+    assert EmbeddingIndex(str(tmp_path), dim=8).search(unit_vector(8, 0), k=1) == [("a", 1.0)]
+
+
+def test_opening_the_index_drops_a_partial_id_line(tmp_path):
+    index = EmbeddingIndex(str(tmp_path), dim=8)
+    index.add(["a"], np.stack([unit_vector(8, 0)]))
+    with open(index.vectors_path, "ab") as f:
+        f.write(unit_vector(8, 5).tobytes())
+    with open(index.ids_path, "a", encoding="utf-8") as f:
+        f.write("orph")
+    
+    reopened = EmbeddingIndex(str(tmp_path), dim=8)
+    reopened.add(["b"], np.stack([unit_vector(8, 1)]))
+    
+    assert len(reopened) == 2
+    assert reopened.search(unit_vector(8, 1), k=1) == [("b", 1.0)]
+
+
+def test_job_vectors_ignore_description_boilerplate():
+    embedder = HashingEmbedder()
+    plain = JobRecord(job_id="1", source="test", title="Backend Engineer", company="Acme",
+                      description="Python and PostgreSQL", url="https://example.com/1")
+    wordy = JobRecord(job_id="2", source="test", title="Backend Engineer", company="Acme",
+                      description="We are a passionate, fast-growing team looking for Python and PostgreSQL talent",
+                      url="https://example.com/2")
+    
+    assert np.allclose(embedder.embed_job(plain), embedder.embed_job(wordy))
@@ -0,0 +1,31 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from services.execution_queue import ExecutionQueue
+
+
+def test_executions_abandoned_after_max_attempts_are_failed():
+    async def scenario():
+        db = mongomock_motor.AsyncMongoMockClient()["test"]
+        expired = datetime.now(timezone.utc) - timedelta(seconds=1)
+        await db.workflow_executions.insert_many([
+            {"id": "exhausted", "status": "running", "attempts": 3, "lease_expires_at": expired, "started_at": "1"},
+            {"id": "retryable", "status": "running", "attempts": 1, "lease_expires_at": expired, "started_at": "2"}
+        ])
+        queue = ExecutionQueue(db, owner="worker", max_attempts=3)
+        
+        await queue.claim()
+        
+        exhausted = await db.workflow_executions.find_one({"id": "exhausted"})
+        retryable = await db.workflow_executions.find_one({"id": "retryable"})
+        assert exhausted["status"] == "failed"
+        assert exhausted["error_message"]
+        assert retryable["status"] == "running"
+        assert retryable["claimed_by"] == "worker"
+        assert retryable["attempts"] == 2
+    
+    asyncio.run(scenario())
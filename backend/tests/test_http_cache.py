@@ -0,0 +1,36 @@
+import os
+import time
+
+from services.http_cache import PageCache
+
+
+def entry(size):
+    return {"url": "u", "etag": None, "last_modified": None, "stored_at": time.time(), "body": "x" * size}
+
+
+def directory_size(path):
+    return sum(p.stat().st_size for p in path.glob("*.json"))
+
+
+def test_workers_sharing_a_directory_stay_near_the_limit(tmp_path):
+    workers = [PageCache(str(tmp_path), max_bytes=100_000) for _ in range(4)]
+    
+    for i in range(200):
+        workers[i % 4]._write(f"key{i}", entry(2_000))
+    
+    # Each worker may only add RESCAN_FRACTION of the limit before it re-scans
+    assert directory_size(tmp_path) <= 100_000 * (1 + 4 * PageCache.RESCAN_FRACTION) + 4 * 2_100
+
+
+def test_scan_removes_orphaned_temp_files(tmp_path):
+    orphan = tmp_path / "dead-writer.tmp"
+    orphan.write_bytes(b"partial")
+    stale = time.time() - PageCache.ORPHAN_SECONDS - 1
+    os.utime(orphan, (stale, stale))
+    in_flight = tmp_path / "live-writer.tmp"
+    in_flight.write_bytes(b"partial")
+    
+    PageCache(str(tmp_path))._write("key", entry(10))
+    
+    assert not orphan.exists()
+    assert in_flight.exists()
@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+from models.job import JobRecord
+from services.job_filter import JobFilter
+from services.job_matcher import JobMatcher
+
+
+def make_job(index, title="Python Engineer"):
+    return JobRecord(job_id=str(index), source="test", title=title, company="Acme", description="", url=f"https://example.com/{index}")
+
+
+def stream_and_record(job_filter, titles):
+    """Stream jobs 0.05s apart; returns (seconds after start, batch size) per scored
+    batch and the time the last job arrived"""
+    matcher = JobMatcher()
+    scored_at = []
+    
+    async def match_batch(resume_data, batch, budget):
+        scored_at.append((time.perf_counter() - start, len(batch)))
+        return batch
+    
+    matcher._match_batch = match_batch
+    
+    async def jobs():
+        nonlocal stream_end
+        for index, title in enumerate(titles):
+            await asyncio.sleep(0.05)
+            yield make_job(index, title)
+        stream_end = time.perf_counter() - start
+    
+    stream_end = None
+    start = time.perf_counter()
+    asyncio.run(matcher.match_stream({}, jobs(), batch_size=5, job_filter=job_filter))
+    return scored_at, stream_end
+
+
+def test_batches_are_scored_as_they_fill_without_filter_rules():
+    job_filter = JobFilter({})
+    
+    scored_at, stream_end = stream_and_record(job_filter, ["Python Engineer"] * 15)
+    
+    assert [size for _, size in scored_at] == [5, 5, 5]
+    assert scored_at[0][0] < stream_end - 0.25  # The first batch doesn't wait for the stream to close
+    assert job_filter.report()["checked"] == 15
+
+
+def test_active_filter_drops_jobs_before_batching():
+    job_filter = JobFilter({"exclude_title_keywords": ["intern"]})
+    titles = ["Python Engineer", "Python Intern"] * 10
+    
+    scored_at, stream_end = stream_and_record(job_filter, titles)
+    
+    assert [size for _, size in scored_at] == [5, 5]
+    assert scored_at[0][0] < stream_end - 0.25  # Scored once five survivors arrived, halfway through
+    assert job_filter.report()["dropped"] == {"title": 10}
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from services.leases import LeaseManager
+
+
+def make_db():
+    return mongomock_motor.AsyncMongoMockClient()["test"]
+
+
+def test_same_replica_cannot_hold_a_lease_twice():
+    async def scenario():
+        db = make_db()
+        replica_a = LeaseManager(db, owner="a", ttl_seconds=30)
+        replica_b = LeaseManager(db, owner="b", ttl_seconds=30)
+        
+        async with replica_a.hold("delta-matching") as outer:
+            assert outer is not None
+            # e.g. a manual delta run while the scheduled one is still going
+            async with replica_a.hold("delta-matching") as inner:
+                assert inner is None
+            # The refused attempt must not have released the outer hold
+            assert await db.leases.find_one({"_id": "delta-matching"}) is not None
+            assert await replica_b.acquire("delta-matching") is None
+        
+        assert await db.leases.find_one({"_id": "delta-matching"}) is None
+        assert await replica_b.acquire("delta-matching") is not None
+    
+    asyncio.run(scenario())
+
+
+def test_stale_token_cannot_renew_or_release_a_reacquired_lease():
+    async def scenario():
+        db = make_db()
+        replica_a = LeaseManager(db, owner="a", ttl_seconds=0.05)
+        replica_b = LeaseManager(db, owner="b", ttl_seconds=30)
+        
+        stale = await replica_a.acquire("digest")
+        await asyncio.sleep(0.1)
+        fresh = await replica_b.acquire("digest")
+        assert fresh is not None
+        
+        assert not await replica_a.renew("digest", stale)
+        await replica_a.release("digest", stale)
+        assert (await db.leases.find_one({"_id": "digest"}))["token"] == fresh
+    
+    asyncio.run(scenario())
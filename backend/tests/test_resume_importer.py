@@ -0,0 +1,59 @@
+import io
+import zipfile
+
+import pytest
+
+from services.resume_importer import ResumeImporter, extract_entry_text
+
+
+def make_zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return buffer
+
+
+def test_oversized_archive_members_are_rejected_before_decompressing():
+    importer = ResumeImporter(None, None, max_file_bytes=1024)
+    bomb = make_zip({"resume.txt": b"a" * 10_000_000})
+    
+    with pytest.raises(ValueError, match="larger than"):
+        importer._entries([("resumes.zip", bomb)])
+
+
+class UnreadableUpload(io.BytesIO):
+    def read(self, *args):
+        raise AssertionError("the upload was read before its size was checked")
+
+
+def test_oversized_files_are_rejected_without_reading_them():
+    importer = ResumeImporter(None, None, max_file_bytes=1024)
+    
+    with pytest.raises(ValueError, match="larger than"):
+        importer._entries([("resume.pdf", UnreadableUpload(b"a" * 2048))])
+
+
+def test_uploads_over_the_total_limit_are_rejected():
+    importer = ResumeImporter(None, None, max_file_bytes=1024, max_total_bytes=2048)
+    archive = make_zip({f"resume{i}.txt": b"a" * 1000 for i in range(3)})
+    
+    with pytest.raises(ValueError, match="expands to more than"):
+        importer._entries([("resumes.zip", archive)])
+
+
+def test_entries_are_read_from_the_spilled_uploads():
+    importer = ResumeImporter(None, None)
+    archive = make_zip({"jane@example.com.txt": b"Python developer", "__MACOSX/._x": b""})
+    uploads = [("resumes.zip", archive), ("john@example.com.txt", io.BytesIO(b"Go developer"))]
+    entries, spilled = importer._spill(importer._entries(uploads))
+    
+    try:
+        (file_name, path, member), (text_name, text_path, text_member) = entries
+        assert extract_entry_text(file_name, path, member, 1024) == ("text", "Python developer")
+        assert extract_entry_text(text_name, text_path, text_member, 1024) == ("text", "Go developer")
+        with pytest.raises(ValueError, match="larger than"):
+            extract_entry_text(file_name, path, member, 4)
+    finally:
+        importer._remove(spilled)
@@ -0,0 +1,20 @@
+from services.resume_preprocessor import ResumePreprocessor, _is_boilerplate
+
+
+def test_employment_date_ranges_are_not_contact_lines():
+    for line in ["2015 - 2019", "2015-2019", "06/2015 - 08/2019", "(2016 - 2020)", "2015 - 2019 2020 - 2022"]:
+        assert not _is_boilerplate(line), line
+
+
+def test_phone_numbers_are_still_contact_lines():
+    for line in ["+1 (555) 123-4567", "555.123.4567", "+44 20 7946 0958", "jane@example.com | 555-123-4567"]:
+        assert _is_boilerplate(line), line
+
+
+def test_date_range_line_survives_preprocessing():
+    resume = "Jane Doe\njane@example.com\n555-123-4567\n\nExperience\nBackend Engineer, Acme\n2015 - 2019\nBuilt payment APIs in Python\n\nSkills\nPython, SQL"
+    
+    prepared = ResumePreprocessor().prepare(resume)
+    
+    assert "2015 - 2019" in prepared.sections["experience"]
+    assert "555-123-4567" not in prepared.text
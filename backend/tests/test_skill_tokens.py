@@ -0,0 +1,11 @@
+from services.skill_tokens import extract_known_skill_tokens, extract_skill_tokens
+
+
+def test_descriptions_only_contribute_known_skills():
+    description = "We are a passionate team building scalable systems with Python, k8s and machine learning."
+    
+    assert extract_known_skill_tokens(description) == ["machine learning", "python", "kubernetes"]
+
+
+def test_titles_keep_every_word():
+    assert extract_skill_tokens("Payments Platform Python Engineer") == ["payments", "platform", "python"]
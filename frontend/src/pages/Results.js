@@ -31,9 +31,9 @@ const Results = () => {
   const fetchJobMatches = async () => {
     try {
       const response = await axios.get(
-        `${API}/jobs/matches/${encodeURIComponent(userEmail)}`
+        `${API}/jobs/summary/${encodeURIComponent(userEmail)}`
       );
-      setMatchedJobs(response.data);
+      setMatchedJobs(response.data.top_matches);
     } catch (error) {
       console.error('Error fetching job matches:', error);
     } finally {